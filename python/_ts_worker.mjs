@@ -0,0 +1,32 @@
+// Long-lived worker for test_cross_validation.py: reads one JSON request per
+// line on stdin ({variant, w, lambda, dataset}) and writes one JSON response
+// per line ({objective, gradient} or {error}) to stdout.
+import { readFileSync } from 'fs';
+import { createInterface } from 'readline';
+import * as sep from '../src/utils/separatingHyperplane.js';
+
+// Parsed datasets, keyed by path
+const datasets = new Map();
+
+function loadPoints(path) {
+  if (!datasets.has(path)) {
+    datasets.set(path, JSON.parse(readFileSync(path, 'utf-8')).points);
+  }
+  return datasets.get(path);
+}
+
+const rl = createInterface({ input: process.stdin });
+
+for await (const line of rl) {
+  try {
+    const { variant, w, lambda, dataset } = JSON.parse(line);
+    const points = loadPoints(dataset);
+
+    const objective = sep[`${variant}Objective`](w, points, lambda);
+    const gradient = sep[`${variant}Gradient`](w, points, lambda);
+
+    console.log(JSON.stringify({ objective, gradient }));
+  } catch (e) {
+    console.log(JSON.stringify({ error: String(e) }));
+  }
+}
@@ -5,6 +5,14 @@ from enum import Enum
 from typing import Any
 
 
+# Absolute slack on final loss comparisons (both sides stop at gtol ~1e-6)
+LOSS_ATOL = 1e-8
+
+# Per-component tolerances on final positions (PASS vs SUSPICIOUS)
+POSITION_RTOL = 1e-2
+POSITION_ATOL = 1e-3
+
+
 class ComparisonStatus(Enum):
     """Comparison result status."""
     PASS = "✅ PASS"
@@ -70,11 +78,13 @@ def compare_results(
         details['issues'] = issues
         return ComparisonStatus.FAIL, details
 
-    # Compare final loss
+    # Compare final loss with a combined test |py - ts| <= atol + rtol*|ts|,
+    # so near-zero optima are not judged on relative error alone. The reported
+    # percentage is relative to |ts| too, matching np.isclose's scaling.
     loss_diff = abs(py_loss - ts_loss)
-    relative_loss_diff = loss_diff / (abs(py_loss) + 1e-10)
+    relative_loss_diff = loss_diff / (abs(ts_loss) + 1e-10)
 
-    if relative_loss_diff > 0.10:  # >10% difference = FAIL
+    if not np.isclose(py_loss, ts_loss, rtol=0.10, atol=LOSS_ATOL):  # >10% difference = FAIL
         issues.append(
             f"Loss differs by {relative_loss_diff*100:.1f}%: "
             f"Python={py_loss:.6e}, TS={ts_loss:.6e}"
@@ -83,14 +93,16 @@ def compare_results(
         return ComparisonStatus.FAIL, details
 
     # Compare final position
-    w_diff = np.linalg.norm(python_result['final_w'] - ts_result['final_w'])
+    py_w = python_result['final_w']
+    ts_w = ts_result['final_w']
+    w_diff = np.linalg.norm(py_w - ts_w)
     if w_diff > 1.0:  # Far apart = FAIL
         issues.append(f"Final positions differ by {w_diff:.4f}")
         details['issues'] = issues
         return ComparisonStatus.FAIL, details
 
     # SUSPICIOUS level checks
-    if relative_loss_diff > 0.01:  # 1-10% difference
+    if not np.isclose(py_loss, ts_loss, rtol=0.01, atol=LOSS_ATOL):  # 1-10% difference
         issues.append(
             f"Loss differs by {relative_loss_diff*100:.2f}%: "
             f"Python={py_loss:.6e}, TS={ts_loss:.6e}"
@@ -107,8 +119,8 @@ def compare_results(
                 f"Python={py_iters}, TS={ts_iters}"
             )
 
-    # Position difference (moderate)
-    if 0.1 < w_diff <= 1.0:
+    # Position difference (any component outside atol + rtol*|ts|)
+    if not np.allclose(py_w, ts_w, rtol=POSITION_RTOL, atol=POSITION_ATOL):
         issues.append(f"Final positions differ by {w_diff:.4f}")
 
     # Return result
@@ -1,9 +1,13 @@
 """Data-based optimization problems (logistic regression, SVM)."""
 
+import functools
 import json
 import numpy as np
 from pathlib import Path
-from typing import Optional
+from scipy.special import expit
+from typing import NamedTuple, Optional
+
+import data_problems_numba as kernels
 
 
 def load_dataset(path: str) -> dict:
@@ -12,49 +16,127 @@ def load_dataset(path: str) -> dict:
         return json.load(f)
 
 
+class Features(NamedTuple):
+    """Dataset arrays shared by all data problems built from the same file."""
+    X: np.ndarray     # n×3 features with a bias column of ones (C-contiguous)
+    XT: np.ndarray    # 3×n C-contiguous copy of X^T, for stride-1 X^T @ v
+    y01: np.ndarray   # Labels in {0, 1}
+    ypm1: np.ndarray  # Labels in {-1, +1}
+    XtX: np.ndarray   # 3×3 Gram matrix X^T X
+    yX: np.ndarray    # Rows y_i * x_i with y in {-1, +1} (SVM margins and gradients)
+
+
+def _load_features(dataset_path: str, dtype: type = np.float64) -> Features:
+    """Load dataset features, reusing the cached parse while the file is unchanged.
+
+    dtype=np.float32 halves the memory traffic of the X @ w products, at
+    ~1e-7 relative accuracy; keep float64 when matching TS to 1e-10.
+    """
+    mtime = Path(dataset_path).stat().st_mtime_ns
+    return _load_features_cached(str(dataset_path), mtime, np.dtype(dtype))
+
+
+@functools.lru_cache(maxsize=16)
+def _load_features_cached(dataset_path: str, mtime: int, dtype: np.dtype) -> Features:
+    """Parse dataset into columnar arrays (mtime is part of the cache key only).
+
+    The arrays are shared between problem instances, so they are read-only.
+    """
+    points = load_dataset(dataset_path)['points']
+    n = len(points)
+
+    X = np.empty((n, 3), dtype=dtype)
+    X[:, 0] = [p['x1'] for p in points]
+    X[:, 1] = [p['x2'] for p in points]
+    X[:, 2] = 1.0  # Bias term
+    y01 = np.fromiter((p['y'] for p in points), dtype=dtype, count=n)
+    ypm1 = 2 * y01 - 1  # 0/1 -> -1/+1
+    XT = np.ascontiguousarray(X.T)
+    XtX = XT @ X
+    yX = ypm1[:, None] * X
+
+    for arr in (X, XT, y01, ypm1, XtX, yX):
+        arr.setflags(write=False)
+    return Features(X, XT, y01, ypm1, XtX, yX)
+
+
+# Below this active fraction, gathering the active rows beats a dense masked product
+_GATHER_FRACTION = 0.2
+
+
+def _masked_row_sum(rows: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Σ rows[i] over mask[i], by gather when the mask is sparse, else a dense GEMV."""
+    if mask.mean() < _GATHER_FRACTION:
+        return rows[mask].sum(axis=0)
+    return mask.astype(rows.dtype) @ rows
+
+
 def sigmoid(z: np.ndarray) -> np.ndarray:
-    """Sigmoid function with clipping to prevent overflow."""
-    z_clipped = np.clip(z, -500, 500)
-    return 1.0 / (1.0 + np.exp(-z_clipped))
+    """Sigmoid function (scipy's expit is overflow-safe without clipping)."""
+    return expit(z)
 
 
 class LogisticRegression:
     """Logistic regression with L2 regularization."""
 
-    def __init__(self, dataset_path: str, lambda_reg: float = 0.01):
-        data = load_dataset(dataset_path)
-        points = data['points']
+    supports_complex_step = True  # complex_objective is analytic in w
 
-        # Extract features and labels
-        self.X = np.array([[p['x1'], p['x2'], 1.0] for p in points])  # Add bias term
-        self.y = np.array([p['y'] for p in points])
+    def __init__(self, dataset_path: str, lambda_reg: float = 0.01, dtype: type = np.float64):
+        features = _load_features(dataset_path, dtype)
+        self.X = features.X  # Includes bias term
+        self.XT = features.XT
+        self.y = features.y01
         self.lambda_reg = lambda_reg
         self.n = len(self.y)
 
+        # Last forward pass, shared by objective/gradient/hessian at the same w
+        self._w = None
+        self._z = None
+        self._sigma = None
+
+    def _forward(self, w: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return (z, sigma) at w, reusing the previous pass when w is unchanged."""
+        if self._w is None or not np.array_equal(w, self._w):
+            self._w = np.array(w, dtype=float)  # Copy: optimizers may update w in place
+            self._z = self.X @ self._w.astype(self.X.dtype, copy=False)
+            self._sigma = sigmoid(self._z)
+        return self._z, self._sigma
+
     def objective(self, w: np.ndarray) -> float:
         """Cross-entropy loss + L2 regularization."""
-        z = self.X @ w
-        sigma = sigmoid(z)
-
-        # Avoid log(0)
-        sigma = np.clip(sigma, 1e-10, 1 - 1e-10)
+        z, _ = self._forward(w)
 
-        # Cross-entropy
-        loss = -np.mean(self.y * np.log(sigma) + (1 - self.y) * np.log(1 - sigma))
+        # Cross-entropy: -[y*log(σ) + (1-y)*log(1-σ)] = log(1 + e^z) - y*z
+        loss = np.mean(np.logaddexp(0.0, z) - self.y * z)
 
         # L2 regularization (only on w0, w1, not bias w2)
         reg = (self.lambda_reg / 2) * (w[0] ** 2 + w[1] ** 2)
 
         return loss + reg
 
+    def batched_objective(self, W: np.ndarray) -> np.ndarray:
+        """Objective at each row of W (m×3) from one W @ X^T product."""
+        Z = W.astype(self.X.dtype, copy=False) @ self.XT
+        loss = np.mean(np.logaddexp(0.0, Z) - self.y * Z, axis=1, dtype=np.float64)
+        reg = (self.lambda_reg / 2) * (W[:, 0] ** 2 + W[:, 1] ** 2)
+        return loss + reg
+
+    def complex_objective(self, w: np.ndarray) -> complex:
+        """Objective for complex w (complex-step differentiation)."""
+        z = self.X @ w
+        # Stable softplus log(1 + e^z): with m = z where Re z > 0 (else 0),
+        # it equals m + log1p(e^(z - 2m)), and Re(z - 2m) <= 0 never overflows
+        m = np.where(z.real > 0, z, 0)
+        loss = np.mean(m + np.log1p(np.exp(z - 2 * m)) - self.y * z)
+        return loss + (self.lambda_reg / 2) * (w[0] ** 2 + w[1] ** 2)
+
     def gradient(self, w: np.ndarray) -> np.ndarray:
         """Gradient of objective."""
-        z = self.X @ w
-        sigma = sigmoid(z)
+        _, sigma = self._forward(w)
         error = sigma - self.y
 
         # Gradient
-        grad = (self.X.T @ error) / self.n
+        grad = (self.XT @ error).astype(np.float64, copy=False) / self.n
 
         # Add regularization gradient (only for w0, w1)
         grad[0] += self.lambda_reg * w[0]
@@ -65,13 +147,11 @@ class LogisticRegression:
 
     def hessian(self, w: np.ndarray) -> np.ndarray:
         """Hessian of objective."""
-        z = self.X @ w
-        sigma = sigmoid(z)
+        _, sigma = self._forward(w)
         d = sigma * (1 - sigma)
 
-        # H = X^T D X / n + λ I (for w0, w1 only)
-        D = np.diag(d)
-        H = (self.X.T @ D @ self.X) / self.n
+        # H = X^T D X / n + λ I (for w0, w1 only), with D = diag(d) applied by broadcasting
+        H = ((self.XT * d) @ self.X).astype(np.float64, copy=False) / self.n
 
         # Add regularization to diagonal (only w0, w1)
         H[0, 0] += self.lambda_reg
@@ -79,42 +159,57 @@ class LogisticRegression:
 
         return H
 
+    def loss_and_grad(self, w: np.ndarray) -> tuple[float, np.ndarray]:
+        """Objective and gradient from a single forward pass (for jac=True)."""
+        return self.objective(w), self.gradient(w)
+
 
 class SoftMarginSVM:
     """Soft-margin SVM with hinge loss."""
 
-    def __init__(self, dataset_path: str, lambda_reg: float = 0.01):
-        data = load_dataset(dataset_path)
-        points = data['points']
-
-        # Extract features and convert labels to {-1, +1}
-        self.X = np.array([[p['x1'], p['x2'], 1.0] for p in points])
-        self.y = np.array([2 * p['y'] - 1 for p in points])  # 0/1 -> -1/+1
+    def __init__(self, dataset_path: str, lambda_reg: float = 0.01, dtype: type = np.float64):
+        # Features with labels in {-1, +1}
+        features = _load_features(dataset_path, dtype)
+        self.X = features.X
+        self.y = features.ypm1
+        self.yX = features.yX
         self.lambda_reg = lambda_reg
         self.n = len(self.y)
+        self._tmp = np.empty(self.n, dtype=self.yX.dtype)  # Scratch for objective
 
     def objective(self, w: np.ndarray) -> float:
         """SVM objective: ||w||^2/2 + λ*Σmax(0, 1-y*z)"""
-        z = self.X @ w
-        margins = 1 - self.y * z
-        hinge_loss = np.maximum(0, margins)
+        if kernels.NUMBA_AVAILABLE:
+            return kernels.soft_margin_objective(self.yX, np.asarray(w, dtype=float), self.lambda_reg)
+
+        # Hinge terms max(0, 1 - y*z) computed in place in the scratch buffer
+        hinge_loss = np.matmul(self.yX, np.asarray(w, dtype=self.yX.dtype), out=self._tmp)
+        np.subtract(1.0, hinge_loss, out=hinge_loss)
+        np.maximum(hinge_loss, 0.0, out=hinge_loss)
 
         # ||w||^2/2 (only w0, w1, not bias)
         reg = 0.5 * (w[0] ** 2 + w[1] ** 2)
 
-        return reg + self.lambda_reg * np.sum(hinge_loss)
+        return reg + self.lambda_reg * hinge_loss.sum()
+
+    def batched_objective(self, W: np.ndarray) -> np.ndarray:
+        """Objective at each row of W (m×3) from one W @ (yX)^T product."""
+        hinge_loss = np.maximum(1.0 - W.astype(self.yX.dtype, copy=False) @ self.yX.T, 0.0)
+        reg = 0.5 * (W[:, 0] ** 2 + W[:, 1] ** 2)
+        return reg + self.lambda_reg * hinge_loss.sum(axis=1, dtype=np.float64)
 
     def gradient(self, w: np.ndarray) -> np.ndarray:
         """Subgradient of SVM objective."""
-        z = self.X @ w
-        margins = 1 - self.y * z
+        if kernels.NUMBA_AVAILABLE:
+            return kernels.soft_margin_gradient(self.yX, np.asarray(w, dtype=float), self.lambda_reg, np.empty(3))
+
+        margins = 1 - self.yX @ np.asarray(w, dtype=self.yX.dtype)
 
         # Subgradient: w + λ*Σ(-y*x) for violated constraints
         grad = np.array([w[0], w[1], 0.0])  # Start with w regularization
 
-        for i in range(self.n):
-            if margins[i] > 0:  # Violated constraint
-                grad -= self.lambda_reg * self.y[i] * self.X[i]
+        active = margins > 0  # Violated constraints
+        grad -= self.lambda_reg * _masked_row_sum(self.yX, active)
 
         return grad
 
@@ -122,97 +217,180 @@ class SoftMarginSVM:
 class PerceptronSVM:
     """Perceptron with regularization."""
 
-    def __init__(self, dataset_path: str, lambda_reg: float = 0.01):
-        data = load_dataset(dataset_path)
-        points = data['points']
-
-        self.X = np.array([[p['x1'], p['x2'], 1.0] for p in points])
-        self.y = np.array([2 * p['y'] - 1 for p in points])
+    def __init__(self, dataset_path: str, lambda_reg: float = 0.01, dtype: type = np.float64):
+        features = _load_features(dataset_path, dtype)
+        self.X = features.X
+        self.y = features.ypm1
+        self.yX = features.yX
         self.lambda_reg = lambda_reg
         self.n = len(self.y)
+        self._tmp = np.empty(self.n, dtype=self.yX.dtype)  # Scratch for objective
 
     def objective(self, w: np.ndarray) -> float:
         """Perceptron objective: Σmax(0, -y*z) + λ/2*||w||^2"""
-        z = self.X @ w
-        perceptron_loss = np.maximum(0, -self.y * z)
+        if kernels.NUMBA_AVAILABLE:
+            return kernels.perceptron_objective(self.yX, np.asarray(w, dtype=float), self.lambda_reg)
+
+        # max(0, -y*z) computed in place in the scratch buffer
+        perceptron_loss = np.matmul(self.yX, np.asarray(w, dtype=self.yX.dtype), out=self._tmp)
+        np.negative(perceptron_loss, out=perceptron_loss)
+        np.maximum(perceptron_loss, 0.0, out=perceptron_loss)
 
         reg = (self.lambda_reg / 2) * (w[0] ** 2 + w[1] ** 2)
 
-        return np.sum(perceptron_loss) + reg
+        return perceptron_loss.sum() + reg
+
+    def batched_objective(self, W: np.ndarray) -> np.ndarray:
+        """Objective at each row of W (m×3) from one W @ (yX)^T product."""
+        perceptron_loss = np.maximum(-(W.astype(self.yX.dtype, copy=False) @ self.yX.T), 0.0)
+        reg = (self.lambda_reg / 2) * (W[:, 0] ** 2 + W[:, 1] ** 2)
+        return perceptron_loss.sum(axis=1, dtype=np.float64) + reg
 
     def gradient(self, w: np.ndarray) -> np.ndarray:
         """Gradient of perceptron objective."""
-        z = self.X @ w
+        if kernels.NUMBA_AVAILABLE:
+            return kernels.perceptron_gradient(self.yX, np.asarray(w, dtype=float), self.lambda_reg, np.empty(3))
+
         grad = np.array([self.lambda_reg * w[0], self.lambda_reg * w[1], 0.0])
 
-        for i in range(self.n):
-            if self.y[i] * z[i] < 0:  # Misclassified
-                grad -= self.y[i] * self.X[i]
+        misclassified = self.yX @ np.asarray(w, dtype=self.yX.dtype) < 0
+        grad -= _masked_row_sum(self.yX, misclassified)
 
         return grad
 
+    def constant_hessian(self) -> np.ndarray:
+        """Hessian λ·diag(1, 1, 0): the loss is piecewise linear, so only the regularizer curves."""
+        return np.diag([self.lambda_reg, self.lambda_reg, 0.0])
+
 
 class SquaredHingeSVM:
     """Squared hinge SVM (smooth variant)."""
 
-    def __init__(self, dataset_path: str, lambda_reg: float = 0.01):
-        data = load_dataset(dataset_path)
-        points = data['points']
+    supports_complex_step = True  # complex_objective is analytic in w away from the kinks
 
-        self.X = np.array([[p['x1'], p['x2'], 1.0] for p in points])
-        self.y = np.array([2 * p['y'] - 1 for p in points])
+    def __init__(self, dataset_path: str, lambda_reg: float = 0.01, dtype: type = np.float64):
+        features = _load_features(dataset_path, dtype)
+        self.X = features.X
+        self.y = features.ypm1
+        self.XT = features.XT
+        self.XtX = features.XtX
+        self.yX = features.yX
         self.lambda_reg = lambda_reg
         self.n = len(self.y)
 
+        # Last forward pass, shared by objective/gradient/hessian at the same w
+        self._w = None
+        self._margins = None
+        self._tmp = np.empty(self.n, dtype=self.yX.dtype)  # Scratch for objective
+
+    def _forward(self, w: np.ndarray) -> np.ndarray:
+        """Return margins 1 - y*z at w, reusing the previous pass when w is unchanged."""
+        if self._w is None or not np.array_equal(w, self._w):
+            self._w = np.array(w, dtype=float)  # Copy: optimizers may update w in place
+            self._margins = 1 - self.yX @ self._w.astype(self.yX.dtype, copy=False)
+        return self._margins
+
     def objective(self, w: np.ndarray) -> float:
         """Squared hinge: ||w||^2/2 + λ*Σ[max(0, 1-y*z)]^2"""
-        z = self.X @ w
-        margins = 1 - self.y * z
-        squared_hinge = np.maximum(0, margins) ** 2
+        if kernels.NUMBA_AVAILABLE:
+            return kernels.squared_hinge_objective(self.yX, np.asarray(w, dtype=float), self.lambda_reg)
+
+        margins = self._forward(w)
+
+        # Scratch buffer keeps the cached margins intact
+        squared_hinge = np.maximum(margins, 0.0, out=self._tmp)
+        np.square(squared_hinge, out=squared_hinge)
 
         reg = 0.5 * (w[0] ** 2 + w[1] ** 2)
 
-        return reg + self.lambda_reg * np.sum(squared_hinge)
+        return reg + self.lambda_reg * squared_hinge.sum()
+
+    def batched_objective(self, W: np.ndarray) -> np.ndarray:
+        """Objective at each row of W (m×3) from one W @ (yX)^T product."""
+        squared_hinge = np.maximum(1.0 - W.astype(self.yX.dtype, copy=False) @ self.yX.T, 0.0)
+        np.square(squared_hinge, out=squared_hinge)
+        reg = 0.5 * (W[:, 0] ** 2 + W[:, 1] ** 2)
+        return reg + self.lambda_reg * squared_hinge.sum(axis=1, dtype=np.float64)
+
+    def complex_objective(self, w: np.ndarray) -> complex:
+        """Objective for complex w (complex-step differentiation); activity uses the real part."""
+        margins = 1 - self.yX @ w
+        active = margins[margins.real > 0]
+        return 0.5 * (w[0] ** 2 + w[1] ** 2) + self.lambda_reg * np.sum(active * active)
 
     def gradient(self, w: np.ndarray) -> np.ndarray:
         """Gradient of squared hinge."""
-        z = self.X @ w
-        margins = 1 - self.y * z
+        if kernels.NUMBA_AVAILABLE:
+            return kernels.squared_hinge_gradient(self.yX, np.asarray(w, dtype=float), self.lambda_reg, np.empty(3))
+
+        margins = self._forward(w)
 
         grad = np.array([w[0], w[1], 0.0])
 
-        for i in range(self.n):
-            if margins[i] > 0:
-                grad -= 2 * self.lambda_reg * margins[i] * self.y[i] * self.X[i]
+        # Σ 2λ·margin·(y x) over active constraints
+        coef = np.where(margins > 0, 2 * self.lambda_reg * margins, 0.0)
+        grad -= coef @ self.yX
 
         return grad
 
     def hessian(self, w: np.ndarray) -> np.ndarray:
         """Hessian of squared hinge."""
-        z = self.X @ w
-        margins = 1 - self.y * z
+        margins = self._forward(w)
 
         H = np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 0.0]])
 
-        for i in range(self.n):
-            if margins[i] > 0:
-                outer = np.outer(self.X[i], self.X[i])
-                H += 2 * self.lambda_reg * outer
+        # Σ x x^T over active constraints (y^2 = 1, so no per-sample weight)
+        active = margins > 0
+        if active.all():
+            gram = self.XtX
+        elif active.mean() < _GATHER_FRACTION:
+            X_active = self.X[active]
+            gram = X_active.T @ X_active
+        else:
+            gram = (self.XT * active) @ self.X
+        H += 2 * self.lambda_reg * gram
 
         return H
 
-
-def get_data_problem(problem: str, variant: Optional[str], dataset_path: str, lambda_reg: float):
-    """Get data-based problem instance."""
+    def loss_and_grad(self, w: np.ndarray) -> tuple[float, np.ndarray]:
+        """Objective and gradient from a single forward pass (for jac=True)."""
+        return self.objective(w), self.gradient(w)
+
+
+def get_data_problem(
+    problem: str,
+    variant: Optional[str],
+    dataset_path: str,
+    lambda_reg: float,
+    dtype: type = np.float64
+):
+    """Get data-based problem instance (dtype sets the storage precision of X, y).
+
+    Instances are memoized per configuration and rebuilt if the dataset changes.
+    """
+    mtime = Path(dataset_path).stat().st_mtime_ns
+    return _get_data_problem_cached(problem, variant, str(dataset_path), mtime, lambda_reg, np.dtype(dtype))
+
+
+@functools.lru_cache(maxsize=64)
+def _get_data_problem_cached(
+    problem: str,
+    variant: Optional[str],
+    dataset_path: str,
+    mtime: int,
+    lambda_reg: float,
+    dtype: np.dtype
+):
+    """Construct a data problem (mtime is part of the cache key only)."""
     if problem == "logistic-regression":
-        return LogisticRegression(dataset_path, lambda_reg)
+        return LogisticRegression(dataset_path, lambda_reg, dtype)
     elif problem == "separating-hyperplane":
         if variant == "soft-margin":
-            return SoftMarginSVM(dataset_path, lambda_reg)
+            return SoftMarginSVM(dataset_path, lambda_reg, dtype)
         elif variant == "perceptron":
-            return PerceptronSVM(dataset_path, lambda_reg)
+            return PerceptronSVM(dataset_path, lambda_reg, dtype)
         elif variant == "squared-hinge":
-            return SquaredHingeSVM(dataset_path, lambda_reg)
+            return SquaredHingeSVM(dataset_path, lambda_reg, dtype)
         else:
             raise ValueError(f"Unknown variant: {variant}")
     else:
@@ -0,0 +1,123 @@
+"""Numba-compiled single-pass kernels for the separating-hyperplane problems.
+
+Each kernel walks the rows y_i * x_i of the shared yX array once,
+accumulating the loss or gradient in a plain loop instead of building
+the n-length temporaries of the NumPy expressions in data_problems.py.
+
+Numba is optional (`uv sync --extra jit`); when it is not installed
+NUMBA_AVAILABLE is False and the classes keep their NumPy code paths.
+"""
+
+import numpy as np
+
+from numba_compat import NUMBA_AVAILABLE, njit
+
+
+@njit(cache=True)
+def soft_margin_objective(yX, w, lam):
+    """||w||^2/2 + λ*Σmax(0, 1-y*z)"""
+    hinge = 0.0
+    for i in range(yX.shape[0]):
+        margin = 1.0 - (yX[i, 0] * w[0] + yX[i, 1] * w[1] + yX[i, 2] * w[2])
+        if margin > 0.0:
+            hinge += margin
+    return 0.5 * (w[0] ** 2 + w[1] ** 2) + lam * hinge
+
+
+@njit(cache=True)
+def soft_margin_gradient(yX, w, lam, out):
+    """Subgradient w - λ*Σ y*x over violated constraints, written into out."""
+    g0 = 0.0
+    g1 = 0.0
+    g2 = 0.0
+    for i in range(yX.shape[0]):
+        margin = 1.0 - (yX[i, 0] * w[0] + yX[i, 1] * w[1] + yX[i, 2] * w[2])
+        if margin > 0.0:
+            g0 += yX[i, 0]
+            g1 += yX[i, 1]
+            g2 += yX[i, 2]
+    out[0] = w[0] - lam * g0
+    out[1] = w[1] - lam * g1
+    out[2] = -lam * g2
+    return out
+
+
+@njit(cache=True)
+def perceptron_objective(yX, w, lam):
+    """Σmax(0, -y*z) + λ/2*||w||^2"""
+    loss = 0.0
+    for i in range(yX.shape[0]):
+        yz = yX[i, 0] * w[0] + yX[i, 1] * w[1] + yX[i, 2] * w[2]
+        if yz < 0.0:
+            loss -= yz
+    return loss + (lam / 2) * (w[0] ** 2 + w[1] ** 2)
+
+
+@njit(cache=True)
+def perceptron_gradient(yX, w, lam, out):
+    """λw - Σ y*x over misclassified points, written into out."""
+    g0 = 0.0
+    g1 = 0.0
+    g2 = 0.0
+    for i in range(yX.shape[0]):
+        yz = yX[i, 0] * w[0] + yX[i, 1] * w[1] + yX[i, 2] * w[2]
+        if yz < 0.0:
+            g0 += yX[i, 0]
+            g1 += yX[i, 1]
+            g2 += yX[i, 2]
+    out[0] = lam * w[0] - g0
+    out[1] = lam * w[1] - g1
+    out[2] = -g2
+    return out
+
+
+@njit(cache=True)
+def squared_hinge_objective(yX, w, lam):
+    """||w||^2/2 + λ*Σ[max(0, 1-y*z)]^2"""
+    hinge = 0.0
+    for i in range(yX.shape[0]):
+        margin = 1.0 - (yX[i, 0] * w[0] + yX[i, 1] * w[1] + yX[i, 2] * w[2])
+        if margin > 0.0:
+            hinge += margin * margin
+    return 0.5 * (w[0] ** 2 + w[1] ** 2) + lam * hinge
+
+
+@njit(cache=True)
+def squared_hinge_gradient(yX, w, lam, out):
+    """w - 2λ*Σ margin*y*x over active constraints, written into out."""
+    g0 = 0.0
+    g1 = 0.0
+    g2 = 0.0
+    for i in range(yX.shape[0]):
+        margin = 1.0 - (yX[i, 0] * w[0] + yX[i, 1] * w[1] + yX[i, 2] * w[2])
+        if margin > 0.0:
+            g0 += margin * yX[i, 0]
+            g1 += margin * yX[i, 1]
+            g2 += margin * yX[i, 2]
+    out[0] = w[0] - 2 * lam * g0
+    out[1] = w[1] - 2 * lam * g1
+    out[2] = -2 * lam * g2
+    return out
+
+
+def _warm_up():
+    """Compile (or load from the on-disk cache) every kernel for float64 inputs.
+
+    Runs at import so the first objective/gradient call inside an optimizer
+    does not pay the JIT cost.
+    """
+    yX = np.zeros((1, 3))
+    yX.setflags(write=False)  # Matches the shared, read-only Features arrays
+    w = np.zeros(3)
+    out = np.empty(3)
+    for objective, gradient in (
+        (soft_margin_objective, soft_margin_gradient),
+        (perceptron_objective, perceptron_gradient),
+        (squared_hinge_objective, squared_hinge_gradient),
+    ):
+        objective(yX, w, 0.0)
+        gradient(yX, w, 0.0, out)
+
+
+if NUMBA_AVAILABLE:
+    _warm_up()
@@ -0,0 +1,18 @@
+"""Optional numba import shared by the compiled kernel modules.
+
+Numba is optional (`uv sync --extra jit`). When it is not installed,
+NUMBA_AVAILABLE is False and njit is a no-op decorator, so the kernel
+modules still import and callers fall back to their NumPy code paths.
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in so kernel modules still import without numba."""
+        def decorator(func):
+            return func
+        return decorator
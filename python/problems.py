@@ -1,11 +1,19 @@
 """Pure mathematical optimization problems (2D)."""
 
+import functools
 import numpy as np
 from typing import Callable, Optional
 
 
 class Problem:
-    """Optimization problem interface."""
+    """Optimization problem interface.
+
+    gradient and hessian return per-problem buffers that are overwritten on
+    the next call (avoiding an allocation per evaluation): a result is only
+    valid until the next call on the same problem, so copy it if it needs to
+    outlive that call. For the same reason, one instance must not be
+    evaluated from several threads at once.
+    """
 
     def __init__(
         self,
@@ -20,17 +28,29 @@ class Problem:
         self.hessian = hessian
 
 
+def _constant(matrix: list[list[float]]) -> np.ndarray:
+    """Read-only array for constant Hessians, so the shared buffer can't be corrupted."""
+    arr = np.array(matrix)
+    arr.setflags(write=False)
+    return arr
+
+
 def quadratic() -> Problem:
     """Well-conditioned quadratic bowl: f(w) = w0^2 + w1^2"""
 
+    g = np.empty(2)
+    H = _constant([[2.0, 0.0], [0.0, 2.0]])
+
     def objective(w: np.ndarray) -> float:
         return w[0] ** 2 + w[1] ** 2
 
     def gradient(w: np.ndarray) -> np.ndarray:
-        return np.array([2 * w[0], 2 * w[1]])
+        g[0] = 2 * w[0]
+        g[1] = 2 * w[1]
+        return g
 
     def hessian(w: np.ndarray) -> np.ndarray:
-        return np.array([[2.0, 0.0], [0.0, 2.0]])
+        return H
 
     return Problem("quadratic", objective, gradient, hessian)
 
@@ -38,14 +58,19 @@ def quadratic() -> Problem:
 def ill_conditioned_quadratic() -> Problem:
     """Ill-conditioned quadratic: f(w) = w0^2 + 100*w1^2 (condition number = 100)"""
 
+    g = np.empty(2)
+    H = _constant([[2.0, 0.0], [0.0, 200.0]])
+
     def objective(w: np.ndarray) -> float:
         return w[0] ** 2 + 100 * w[1] ** 2
 
     def gradient(w: np.ndarray) -> np.ndarray:
-        return np.array([2 * w[0], 200 * w[1]])
+        g[0] = 2 * w[0]
+        g[1] = 200 * w[1]
+        return g
 
     def hessian(w: np.ndarray) -> np.ndarray:
-        return np.array([[2.0, 0.0], [0.0, 200.0]])
+        return H
 
     return Problem("ill-conditioned-quadratic", objective, gradient, hessian)
 
@@ -53,19 +78,22 @@ def ill_conditioned_quadratic() -> Problem:
 def rosenbrock() -> Problem:
     """Rosenbrock banana function: f(w) = (1-w0)^2 + 100*(w1-w0^2)^2"""
 
+    g = np.empty(2)
+    H = np.empty((2, 2))
+
     def objective(w: np.ndarray) -> float:
         return (1 - w[0]) ** 2 + 100 * (w[1] - w[0] ** 2) ** 2
 
     def gradient(w: np.ndarray) -> np.ndarray:
-        dw0 = -2 * (1 - w[0]) - 400 * w[0] * (w[1] - w[0] ** 2)
-        dw1 = 200 * (w[1] - w[0] ** 2)
-        return np.array([dw0, dw1])
+        g[0] = -2 * (1 - w[0]) - 400 * w[0] * (w[1] - w[0] ** 2)
+        g[1] = 200 * (w[1] - w[0] ** 2)
+        return g
 
     def hessian(w: np.ndarray) -> np.ndarray:
-        h00 = 2 - 400 * (w[1] - w[0] ** 2) + 800 * w[0] ** 2
-        h01 = -400 * w[0]
-        h11 = 200.0
-        return np.array([[h00, h01], [h01, h11]])
+        H[0, 0] = 2 - 400 * (w[1] - w[0] ** 2) + 800 * w[0] ** 2
+        H[0, 1] = H[1, 0] = -400 * w[0]
+        H[1, 1] = 200.0
+        return H
 
     return Problem("rosenbrock", objective, gradient, hessian)
 
@@ -73,14 +101,19 @@ def rosenbrock() -> Problem:
 def non_convex_saddle() -> Problem:
     """Non-convex saddle: f(w) = w0^2 - w1^2 (unbounded)"""
 
+    g = np.empty(2)
+    H = _constant([[2.0, 0.0], [0.0, -2.0]])
+
     def objective(w: np.ndarray) -> float:
         return w[0] ** 2 - w[1] ** 2
 
     def gradient(w: np.ndarray) -> np.ndarray:
-        return np.array([2 * w[0], -2 * w[1]])
+        g[0] = 2 * w[0]
+        g[1] = -2 * w[1]
+        return g
 
     def hessian(w: np.ndarray) -> np.ndarray:
-        return np.array([[2.0, 0.0], [0.0, -2.0]])
+        return H
 
     return Problem("non-convex-saddle", objective, gradient, hessian)
 
@@ -91,6 +124,9 @@ def himmelblau() -> Problem:
     Classic multimodal test function with four global minima (all f = 0).
     """
 
+    g = np.empty(2)
+    H = np.empty((2, 2))
+
     def objective(w: np.ndarray) -> float:
         term1 = w[0] ** 2 + w[1] - 11
         term2 = w[0] + w[1] ** 2 - 7
@@ -99,17 +135,17 @@ def himmelblau() -> Problem:
     def gradient(w: np.ndarray) -> np.ndarray:
         term1 = w[0] ** 2 + w[1] - 11
         term2 = w[0] + w[1] ** 2 - 7
-        dw0 = 4 * w[0] * term1 + 2 * term2
-        dw1 = 2 * term1 + 4 * w[1] * term2
-        return np.array([dw0, dw1])
+        g[0] = 4 * w[0] * term1 + 2 * term2
+        g[1] = 2 * term1 + 4 * w[1] * term2
+        return g
 
     def hessian(w: np.ndarray) -> np.ndarray:
         term1 = w[0] ** 2 + w[1] - 11
         term2 = w[0] + w[1] ** 2 - 7
-        h00 = 4 * term1 + 8 * w[0] ** 2 + 2
-        h01 = 4 * w[0] + 4 * w[1]
-        h11 = 2 + 4 * term2 + 8 * w[1] ** 2
-        return np.array([[h00, h01], [h01, h11]])
+        H[0, 0] = 4 * term1 + 8 * w[0] ** 2 + 2
+        H[0, 1] = H[1, 0] = 4 * w[0] + 4 * w[1]
+        H[1, 1] = 2 + 4 * term2 + 8 * w[1] ** 2
+        return H
 
     return Problem("himmelblau", objective, gradient, hessian)
 
@@ -119,6 +155,8 @@ def three_hump_camel() -> Problem:
 
     Multimodal function with one global minimum at (0, 0) and two local minima.
     """
+    g = np.empty(2)
+    H = np.empty((2, 2))
 
     def objective(w: np.ndarray) -> float:
         return (
@@ -130,21 +168,27 @@ def three_hump_camel() -> Problem:
         )
 
     def gradient(w: np.ndarray) -> np.ndarray:
-        dw0 = 4 * w[0] - 4.2 * w[0] ** 3 + w[0] ** 5 + w[1]
-        dw1 = w[0] + 2 * w[1]
-        return np.array([dw0, dw1])
+        g[0] = 4 * w[0] - 4.2 * w[0] ** 3 + w[0] ** 5 + w[1]
+        g[1] = w[0] + 2 * w[1]
+        return g
 
     def hessian(w: np.ndarray) -> np.ndarray:
-        h00 = 4 - 12.6 * w[0] ** 2 + 5 * w[0] ** 4
-        h01 = 1.0
-        h11 = 2.0
-        return np.array([[h00, h01], [h01, h11]])
+        H[0, 0] = 4 - 12.6 * w[0] ** 2 + 5 * w[0] ** 4
+        H[0, 1] = H[1, 0] = 1.0
+        H[1, 1] = 2.0
+        return H
 
     return Problem("three-hump-camel", objective, gradient, hessian)
 
 
+@functools.lru_cache(maxsize=None)
 def get_problem(name: str) -> Problem:
-    """Get problem by name."""
+    """Get problem by name.
+
+    Memoized, so every caller in a process shares one instance, including its
+    gradient/Hessian buffers (see Problem): copy results that must survive a
+    later evaluation by anyone.
+    """
     problems = {
         "quadratic": quadratic,
         "ill-conditioned-quadratic": ill_conditioned_quadratic,
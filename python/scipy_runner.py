@@ -1,26 +1,111 @@
 """Scipy optimizer wrapper with iteration capture."""
 
+import math
 import numpy as np
 from scipy import optimize
 from typing import Any, Optional
 
+from data_problems import LogisticRegression
+from problems import Problem
+from gd_numba import NUMBA_AVAILABLE, gd_fixed_logreg, gd_linesearch_logreg
+
+
+def _norm(v: np.ndarray) -> float:
+    """Euclidean norm; sqrt(v·v) skips np.linalg.norm's dispatch for the tiny vectors here."""
+    if len(v) > 64:
+        return float(np.linalg.norm(v))
+    return math.sqrt(float(v @ v))
+
+
+class IterationHistory:
+    """Per-iteration state stored as preallocated arrays (w, loss, grad_norm).
+
+    Indexing returns the {'iter', 'w', 'loss', 'grad_norm'} dict for that
+    iteration and slicing returns a list of them, so callers can treat it
+    like the list of dicts it replaces.
+    """
+
+    def __init__(self, dim: int, capacity: int):
+        capacity = max(capacity, 1)
+        self._w = np.empty((capacity, dim))
+        self._loss = np.empty(capacity)
+        self._grad_norm = np.empty(capacity)
+        self._count = 0
+
+    @classmethod
+    def from_arrays(cls, w: np.ndarray, loss: np.ndarray, grad_norm: np.ndarray) -> 'IterationHistory':
+        """Wrap already-filled arrays (e.g. from a compiled loop) without copying."""
+        history = cls.__new__(cls)
+        history._w = w
+        history._loss = loss
+        history._grad_norm = grad_norm
+        history._count = len(loss)
+        return history
+
+    def append(self, w: np.ndarray, loss: float, grad_norm: float):
+        """Record one iteration (w is copied into the buffer)."""
+        if self._count == len(self._loss):
+            self._grow()
+        i = self._count
+        self._w[i] = w
+        self._loss[i] = loss
+        self._grad_norm[i] = grad_norm
+        self._count += 1
+
+    def _grow(self):
+        """Double the buffer capacity."""
+        capacity = 2 * len(self._loss)
+        self._w = np.resize(self._w, (capacity, self._w.shape[1]))
+        self._loss = np.resize(self._loss, capacity)
+        self._grad_norm = np.resize(self._grad_norm, capacity)
+
+    @property
+    def w(self) -> np.ndarray:
+        return self._w[:self._count]
+
+    @property
+    def loss(self) -> np.ndarray:
+        return self._loss[:self._count]
+
+    @property
+    def grad_norm(self) -> np.ndarray:
+        return self._grad_norm[:self._count]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('iteration index out of range')
+        return self._row(index)
+
+    def __iter__(self):
+        return (self._row(i) for i in range(self._count))
+
+    def _row(self, i: int) -> dict:
+        return {
+            'iter': i,
+            'w': self._w[i].copy(),
+            'loss': self._loss[i],
+            'grad_norm': self._grad_norm[i]
+        }
+
 
 class IterationCallback:
     """Captures iteration data during optimization."""
 
-    def __init__(self, problem: Any):
+    def __init__(self, problem: Any, dim: int, max_iter: int):
         self.problem = problem
-        self.iterations = []
+        self.iterations = IterationHistory(dim, max_iter + 1)
 
     def __call__(self, xk: np.ndarray, *args, **kwargs):
         """Called by scipy after each iteration."""
         grad = self.problem.gradient(xk)
-        self.iterations.append({
-            'iter': len(self.iterations),
-            'w': xk.copy(),
-            'loss': self.problem.objective(xk),
-            'grad_norm': np.linalg.norm(grad)
-        })
+        self.iterations.append(xk, self.problem.objective(xk), _norm(grad))
 
 
 def gradient_descent_fixed(
@@ -32,19 +117,14 @@ def gradient_descent_fixed(
 ) -> dict:
     """Fixed-step gradient descent (scipy doesn't have this)."""
     w = x0.copy()
-    iterations = []
+    iterations = IterationHistory(len(w), max_iter + 1)
 
     for i in range(max_iter):
         grad = problem.gradient(w)
-        grad_norm = np.linalg.norm(grad)
+        grad_norm = _norm(grad)
         loss = problem.objective(w)
 
-        iterations.append({
-            'iter': i,
-            'w': w.copy(),
-            'loss': loss,
-            'grad_norm': grad_norm
-        })
+        iterations.append(w, loss, grad_norm)
 
         if grad_norm < tol:
             return {
@@ -61,15 +141,10 @@ def gradient_descent_fixed(
 
     # Did not converge
     final_grad = problem.gradient(w)
-    final_grad_norm = np.linalg.norm(final_grad)
+    final_grad_norm = _norm(final_grad)
     final_loss = problem.objective(w)
 
-    iterations.append({
-        'iter': max_iter,
-        'w': w.copy(),
-        'loss': final_loss,
-        'grad_norm': final_grad_norm
-    })
+    iterations.append(w, final_loss, final_grad_norm)
 
     return {
         'converged': False,
@@ -102,19 +177,14 @@ def gradient_descent_linesearch(
     This is a reference implementation, not using scipy's optimizers.
     """
     w = x0.copy()
-    iterations = []
+    iterations = IterationHistory(len(w), max_iter + 1)
+    loss = problem.objective(w)
 
     for i in range(max_iter):
-        loss = problem.objective(w)
         grad = problem.gradient(w)
-        grad_norm = np.linalg.norm(grad)
+        grad_norm = _norm(grad)
 
-        iterations.append({
-            'iter': i,
-            'w': w.copy(),
-            'loss': loss,
-            'grad_norm': grad_norm
-        })
+        iterations.append(w, loss, grad_norm)
 
         # Check convergence
         if grad_norm < tol:
@@ -145,21 +215,21 @@ def gradient_descent_linesearch(
 
             # Backtrack
             alpha *= rho
+        else:
+            # No trial accepted: take the last backtracked step
+            w_new = w + alpha * direction
+            new_loss = problem.objective(w_new)
 
-        # Update weights with accepted step size
-        w = w + alpha * direction
+        # Update weights with accepted step size; its loss carries over
+        # to the next iteration instead of being recomputed
+        w, loss = w_new, new_loss
 
     # Did not converge
-    final_loss = problem.objective(w)
+    final_loss = loss
     final_grad = problem.gradient(w)
-    final_grad_norm = np.linalg.norm(final_grad)
+    final_grad_norm = _norm(final_grad)
 
-    iterations.append({
-        'iter': max_iter,
-        'w': w.copy(),
-        'loss': final_loss,
-        'grad_norm': final_grad_norm
-    })
+    iterations.append(w, final_loss, final_grad_norm)
 
     return {
         'converged': False,
@@ -172,6 +242,44 @@ def gradient_descent_linesearch(
     }
 
 
+def gradient_descent_logreg_numba(
+    problem: LogisticRegression,
+    algorithm: str,
+    x0: np.ndarray,
+    max_iter: int,
+    tol: float = 1e-6,
+    alpha: float = 0.01,
+    c1: float = 0.0001,
+    rho: float = 0.5,
+    max_line_search_trials: int = 20
+) -> dict:
+    """Fixed-step or line-search GD on logistic regression via the Numba kernels."""
+    x0 = np.asarray(x0, dtype=float)
+    # The kernels are compiled for float64; float32 feature storage is cast up
+    X = np.asarray(problem.X, dtype=np.float64)
+    y = np.asarray(problem.y, dtype=np.float64)
+    if algorithm == 'gd-fixed':
+        W, losses, grad_norms, count, converged = gd_fixed_logreg(
+            X, y, problem.lambda_reg, x0, alpha, max_iter, tol
+        )
+    else:
+        W, losses, grad_norms, count, converged = gd_linesearch_logreg(
+            X, y, problem.lambda_reg, x0, max_iter, tol,
+            c1, rho, max_line_search_trials
+        )
+
+    iterations = IterationHistory.from_arrays(W[:count], losses[:count], grad_norms[:count])
+    return {
+        'converged': converged,
+        'iterations': count if converged else max_iter,
+        'final_loss': losses[count - 1],
+        'final_w': W[count - 1].copy(),
+        'final_grad_norm': grad_norms[count - 1],
+        'message': f'Converged: grad_norm < {tol}' if converged else 'Max iterations reached',
+        'iteration_history': iterations
+    }
+
+
 def run_scipy_optimizer(
     problem: Any,
     algorithm: str,
@@ -182,6 +290,14 @@ def run_scipy_optimizer(
 ) -> dict:
     """Run scipy optimizer with iteration capture."""
 
+    # Compiled GD loops for logistic regression when numba is installed
+    if (NUMBA_AVAILABLE and algorithm in ('gd-fixed', 'gd-linesearch')
+            and isinstance(problem, LogisticRegression)):
+        return gradient_descent_logreg_numba(
+            problem, algorithm, x0, max_iter, tol,
+            alpha=kwargs.get('alpha', 0.01), c1=kwargs.get('c1', 0.0001)
+        )
+
     # Handle fixed-step GD separately
     if algorithm == 'gd-fixed':
         alpha = kwargs.get('alpha', 0.01)
@@ -202,7 +318,7 @@ def run_scipy_optimizer(
         raise ValueError(f"Unknown algorithm: {algorithm}")
 
     method = method_map[algorithm]
-    callback = IterationCallback(problem)
+    callback = IterationCallback(problem, len(x0), max_iter)
 
     # Prepare scipy options
     options = {
@@ -221,25 +337,43 @@ def run_scipy_optimizer(
     hess = None
     if method == 'Newton-CG' and hasattr(problem, 'hessian') and problem.hessian:
         hess = problem.hessian
+        if isinstance(problem, Problem):
+            hess = lambda x: problem.hessian(x).copy()
+
+    # Use the fused objective+gradient when the problem provides one
+    if hasattr(problem, 'loss_and_grad'):
+        fun, jac = problem.loss_and_grad, True
+    elif isinstance(problem, Problem):
+        # Pure problems return reused buffers; scipy keeps the previous gradient
+        fun, jac = problem.objective, lambda x: problem.gradient(x).copy()
+    else:
+        fun, jac = problem.objective, problem.gradient
 
     # Run optimization
     try:
         result = optimize.minimize(
-            problem.objective,
+            fun,
             x0=x0,
             method=method,
-            jac=problem.gradient,
+            jac=jac,
             hess=hess,
             callback=callback,
             options=options
         )
 
+        # The last callback usually saw result.x already; only re-evaluate if not
+        history = callback.iterations
+        if len(history) and np.array_equal(history.w[-1], result.x):
+            final_grad_norm = history.grad_norm[-1]
+        else:
+            final_grad_norm = _norm(problem.gradient(result.x))
+
         return {
             'converged': result.success,
             'iterations': len(callback.iterations),
             'final_loss': result.fun,
             'final_w': result.x,
-            'final_grad_norm': np.linalg.norm(problem.gradient(result.x)),
+            'final_grad_norm': final_grad_norm,
             'message': result.message,
             'iteration_history': callback.iterations
         }
@@ -6,8 +6,12 @@ This test compares the outputs of Python and TypeScript implementations
 at the same test points to ensure they produce identical results.
 """
 
+import atexit
 import json
+import os
+import select
 import subprocess
+import time
 import numpy as np
 from pathlib import Path
 from data_problems import (
@@ -18,45 +22,94 @@ from data_problems import (
 )
 
 
-def call_ts_separating_hyperplane(variant: str, w: np.ndarray, lambda_reg: float, dataset_path: str) -> dict:
-    """Call TypeScript implementation to get objective and gradient."""
-    # Create a simple Node script to call the TypeScript functions
-    # Use relative import from parent directory
-    ts_script = f"""
-import {{ readFileSync }} from 'fs';
-import {{ {variant}Objective, {variant}Gradient }} from '../src/utils/separatingHyperplane.js';
+_ts_worker = None
+_ts_worker_buffer = b''  # Worker output read but not yet consumed as whole lines
+TS_WORKER_TIMEOUT = 5  # Seconds to wait for one reply
 
-const data = JSON.parse(readFileSync('{dataset_path}', 'utf-8'));
-const w = {json.dumps(w.tolist())};
-const lambda = {lambda_reg};
 
-const objective = {variant}Objective(w, data.points, lambda);
-const gradient = {variant}Gradient(w, data.points, lambda);
+def _get_ts_worker() -> subprocess.Popen:
+    """Start the Node worker on first use; it serves every later call."""
+    global _ts_worker, _ts_worker_buffer
+    if _ts_worker is None or _ts_worker.poll() is not None:
+        # Binary and unbuffered, so replies can be read with a deadline
+        _ts_worker = subprocess.Popen(
+            ['node', '_ts_worker.mjs'],
+            cwd=Path(__file__).parent,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=None,  # Inherited: an undrained pipe could fill up and stall the worker
+            bufsize=0
+        )
+        _ts_worker_buffer = b''
+    return _ts_worker
 
-console.log(JSON.stringify({{ objective, gradient }}));
-"""
 
-    # Write temp script
-    script_path = Path(__file__).parent / "_temp_ts_test.mjs"
-    script_path.write_text(ts_script)
+def _read_ts_line(worker: subprocess.Popen, timeout: float) -> str:
+    """Next line from the worker; '' if it exits, raises TimeoutError after timeout."""
+    global _ts_worker_buffer
+    deadline = time.monotonic() + timeout
+    fd = worker.stdout.fileno()
 
-    try:
-        result = subprocess.run(
-            ['node', str(script_path)],
-            cwd=Path(__file__).parent,
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
+    while b'\n' not in _ts_worker_buffer:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+            raise TimeoutError
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            return ''
+        _ts_worker_buffer += chunk
+
+    line, _ts_worker_buffer = _ts_worker_buffer.split(b'\n', 1)
+    return line.decode('utf-8', errors='replace')
 
-        if result.returncode != 0:
-            print(f"Error calling TypeScript: {result.stderr}")
-            return None
 
-        return json.loads(result.stdout.strip())
-    finally:
-        if script_path.exists():
-            script_path.unlink()
+def _close_ts_worker():
+    """Close the worker's stdin so it exits after finishing pending requests."""
+    global _ts_worker
+    if _ts_worker is not None:
+        _ts_worker.stdin.close()
+        try:
+            _ts_worker.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            _ts_worker.kill()
+            _ts_worker.wait()
+        _ts_worker = None
+
+
+atexit.register(_close_ts_worker)
+
+
+def call_ts_separating_hyperplane(variant: str, w: np.ndarray, lambda_reg: float, dataset_path: str) -> dict:
+    """Call TypeScript implementation to get objective and gradient."""
+    worker = _get_ts_worker()
+    request = {'variant': variant, 'w': w.tolist(), 'lambda': lambda_reg, 'dataset': dataset_path}
+
+    try:
+        worker.stdin.write((json.dumps(request) + '\n').encode('utf-8'))
+        line = _read_ts_line(worker, TS_WORKER_TIMEOUT)
+    except BrokenPipeError:
+        line = ''
+    except TimeoutError:
+        # A stuck worker would answer this request late; start afresh next call
+        worker.kill()
+        worker.wait()
+        print(f"Error calling TypeScript: no reply within {TS_WORKER_TIMEOUT}s")
+        return None
+
+    if not line:
+        # The worker died or closed stdout; make sure it is gone (its stderr
+        # went straight to ours)
+        worker.kill()
+        worker.wait()
+        print(f"Error calling TypeScript: worker exited with code {worker.returncode}")
+        return None
+
+    result = json.loads(line)
+    if 'error' in result:
+        print(f"Error calling TypeScript: {result['error']}")
+        return None
+
+    return result
 
 
 def test_separating_hyperplane_cross_validation():
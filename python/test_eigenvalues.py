@@ -55,11 +55,16 @@ test_cases = [
     }
 ]
 
-def compute_eigenvalues_numpy(A):
-    """Compute eigenvalues using numpy (ground truth)."""
-    eigenvalues, _ = np.linalg.eig(A)
-    # Sort by absolute value (largest first) to match TypeScript
-    return sorted(eigenvalues, key=lambda x: abs(x), reverse=True)
+def compute_all_eigenvalues_numpy(cases):
+    """Ground-truth eigenvalues for every case, with one batched eigvalsh call per matrix size."""
+    results = [None] * len(cases)
+    for n in sorted({len(c["matrix"]) for c in cases}):
+        indices = [i for i, c in enumerate(cases) if len(c["matrix"]) == n]
+        stacked = np.stack([np.array(cases[i]["matrix"], dtype=float) for i in indices])
+        for i, eigenvalues in zip(indices, np.linalg.eigvalsh(stacked)):
+            # Sort by absolute value (largest first) to match TypeScript
+            results[i] = sorted(eigenvalues, key=lambda x: abs(x), reverse=True)
+    return results
 
 def verify_analytical_2x2(A):
     """Verify 2x2 analytical formula."""
@@ -114,6 +119,8 @@ print("EIGENVALUE COMPUTATION - NUMPY REFERENCE")
 print("=" * 80)
 print()
 
+all_numpy_eigs = compute_all_eigenvalues_numpy(test_cases)
+
 for i, test_case in enumerate(test_cases, 1):
     name = test_case["name"]
     matrix = np.array(test_case["matrix"])
@@ -125,7 +132,7 @@ for i, test_case in enumerate(test_cases, 1):
         print(f"     {row}")
 
     # Compute with numpy (ground truth)
-    numpy_eigs = compute_eigenvalues_numpy(matrix)
+    numpy_eigs = all_numpy_eigs[i - 1]
     print(f"   NumPy eigenvalues: {[f'{e:.8f}' for e in numpy_eigs]}")
 
     # Verify analytical formula
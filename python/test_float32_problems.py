@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Run float32 data problems through run_scipy_optimizer.
+
+Every algorithm should accept single-precision feature storage and land on
+(nearly) the same final loss as the float64 problem.
+
+Usage:
+    cd python && python test_float32_problems.py
+"""
+
+import numpy as np
+from pathlib import Path
+from data_problems import get_data_problem
+from scipy_runner import run_scipy_optimizer
+
+VARIANTS = [None, 'soft-margin', 'perceptron', 'squared-hinge']
+ALGORITHMS = ['gd-fixed', 'gd-linesearch', 'newton', 'lbfgs']
+
+
+def main():
+    dataset_path = str(Path(__file__).parent / "datasets" / "crescent.json")
+    failures = 0
+
+    for variant in VARIANTS:
+        problem_name = 'logistic-regression' if variant is None else 'separating-hyperplane'
+        p64 = get_data_problem(problem_name, variant, dataset_path, 0.01)
+        p32 = get_data_problem(problem_name, variant, dataset_path, 0.01, dtype=np.float32)
+        label = variant or problem_name
+
+        for algorithm in ALGORITHMS:
+            r64 = run_scipy_optimizer(p64, algorithm, np.zeros(3), 100, alpha=0.1)
+            try:
+                r32 = run_scipy_optimizer(p32, algorithm, np.zeros(3), 100, alpha=0.1)
+            except Exception as e:
+                print(f"❌ {label} + {algorithm}: {type(e).__name__}: {e}")
+                failures += 1
+                continue
+
+            ok = np.isclose(r32['final_loss'], r64['final_loss'], rtol=1e-3, atol=1e-6)
+            status = "✅" if ok else "❌"
+            print(f"{status} {label} + {algorithm}: "
+                  f"loss {r32['final_loss']:.6e} (float64: {r64['final_loss']:.6e})")
+            failures += not ok
+
+    if failures:
+        print(f"\n❌ {failures} float32 runs failed")
+        return 1
+    print("\n✅ All float32 runs match float64")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -9,9 +9,12 @@ Usage:
 
 For a function f(w), the gradient should satisfy:
 ∇f(w)[i] ≈ (f(w + ε·e_i) - f(w - ε·e_i)) / (2ε)
+or, for smooth objectives, the complex-step form ∇f(w)[i] ≈ Im f(w + iε·e_i) / ε.
 
-For the Hessian, the second derivative should satisfy:
-H[i,j] ≈ (f(w + ε·e_i + ε·e_j) - f(w + ε·e_i - ε·e_j) - f(w - ε·e_i + ε·e_j) + f(w - ε·e_i - ε·e_j)) / (4ε²)
+For the Hessian, the second derivatives should satisfy:
+H[i,i] ≈ (f(w + ε·e_i) - 2f(w) + f(w - ε·e_i)) / ε²
+H[i,j] ≈ (f(w + ε·e_i + ε·e_j) + f(w - ε·e_i - ε·e_j) - f(w ± ε·e_i) - f(w ± ε·e_j) + 2f(w)) / (2ε²)
+where f(w ± ε·e_i) is shorthand for f(w + ε·e_i) + f(w - ε·e_i).
 
 This test verifies that analytical derivatives match numerical approximations.
 """
@@ -26,11 +29,24 @@ from data_problems import (
 )
 
 
-def numerical_gradient(func, w: np.ndarray, epsilon: float = 1e-7) -> np.ndarray:
-    """Compute gradient using central finite differences."""
+def numerical_gradient(func, w: np.ndarray, epsilon: float = 1e-7, batched_func=None) -> np.ndarray:
+    """Compute gradient using central finite differences.
+
+    If batched_func is given (e.g. problem.batched_objective), all 2n
+    perturbed points are evaluated as rows of one matrix in a single call.
+    """
+    n = len(w)
+
+    if batched_func is not None:
+        W = np.repeat(np.asarray(w, dtype=float)[None, :], 2 * n, axis=0)
+        W[:n] += epsilon * np.eye(n)
+        W[n:] -= epsilon * np.eye(n)
+        vals = batched_func(W)
+        return (vals[:n] - vals[n:]) / (2 * epsilon)
+
     grad = np.zeros_like(w)
 
-    for i in range(len(w)):
+    for i in range(n):
         w_plus = w.copy()
         w_minus = w.copy()
 
@@ -42,31 +58,60 @@ def numerical_gradient(func, w: np.ndarray, epsilon: float = 1e-7) -> np.ndarray
     return grad
 
 
-def numerical_hessian(func, w: np.ndarray, epsilon: float = 1e-5) -> np.ndarray:
-    """Compute Hessian using central finite differences."""
-    n = len(w)
-    H = np.zeros((n, n))
+def numerical_gradient_cs(func, w: np.ndarray, epsilon: float = 1e-30) -> np.ndarray:
+    """Compute gradient by complex-step differentiation: Im f(w + iε·e_i) / ε.
 
-    for i in range(n):
-        for j in range(n):
-            w_pp = w.copy()
-            w_pm = w.copy()
-            w_mp = w.copy()
-            w_mm = w.copy()
+    One evaluation per axis and no subtractive cancellation, so the result is
+    accurate to machine precision. func must be analytic in w.
+    """
+    grad = np.zeros(len(w))
+    wc = np.asarray(w, dtype=np.complex128).copy()
 
-            w_pp[i] += epsilon
-            w_pp[j] += epsilon
+    for i in range(len(w)):
+        wc[i] += 1j * epsilon
+        grad[i] = func(wc).imag / epsilon
+        wc[i] = w[i]
 
-            w_pm[i] += epsilon
-            w_pm[j] -= epsilon
+    return grad
 
-            w_mp[i] -= epsilon
-            w_mp[j] += epsilon
 
-            w_mm[i] -= epsilon
-            w_mm[j] -= epsilon
+def numerical_hessian(func, w: np.ndarray, epsilon: float = 1e-4) -> np.ndarray:
+    """Compute Hessian using central finite differences.
 
-            H[i, j] = (func(w_pp) - func(w_pm) - func(w_mp) + func(w_mm)) / (4 * epsilon**2)
+    Shares the single-axis evaluations f(w ± ε·e_i) between the diagonal and
+    off-diagonal entries and uses symmetry, so it needs n² + n + 1 calls
+    instead of 4n². A single buffer is perturbed and restored in place.
+    """
+    n = len(w)
+    H = np.zeros((n, n))
+    wp = np.array(w, dtype=float)
+
+    f0 = func(wp)
+    f_plus = np.empty(n)
+    f_minus = np.empty(n)
+    for i in range(n):
+        wp[i] += epsilon
+        f_plus[i] = func(wp)
+        wp[i] -= 2 * epsilon
+        f_minus[i] = func(wp)
+        wp[i] = w[i]
+
+    for i in range(n):
+        H[i, i] = (f_plus[i] - 2 * f0 + f_minus[i]) / epsilon**2
+
+        for j in range(i + 1, n):
+            wp[i] += epsilon
+            wp[j] += epsilon
+            f_pp = func(wp)
+            wp[i] -= 2 * epsilon
+            wp[j] -= 2 * epsilon
+            f_mm = func(wp)
+            wp[i] = w[i]
+            wp[j] = w[j]
+
+            H[i, j] = H[j, i] = (
+                f_pp + f_mm - f_plus[i] - f_plus[j] - f_minus[i] - f_minus[j] + 2 * f0
+            ) / (2 * epsilon**2)
 
     return H
 
@@ -76,22 +121,25 @@ def test_gradient(name: str, problem, w: np.ndarray, threshold: float = 1e-4) ->
     print(f"\n=== Testing {name} Gradient ===")
 
     analytic_grad = problem.gradient(w)
-    numeric_grad = numerical_gradient(problem.objective, w)
+    if getattr(problem, 'supports_complex_step', False):
+        # Trusts complex_objective run by test_complex_objective
+        numeric_grad = numerical_gradient_cs(problem.complex_objective, w)
+    else:
+        numeric_grad = numerical_gradient(
+            problem.objective, w, batched_func=getattr(problem, 'batched_objective', None)
+        )
 
     print(f"Analytic gradient: {analytic_grad}")
     print(f"Numeric gradient:  {numeric_grad}")
 
-    # Compute relative error for each component
-    errors = []
-    for i in range(len(w)):
-        abs_error = abs(analytic_grad[i] - numeric_grad[i])
-        scale = max(abs(analytic_grad[i]), abs(numeric_grad[i]), 1e-10)
-        rel_error = abs_error / scale
-        errors.append(rel_error)
+    # Relative error for each component
+    abs_err = np.abs(analytic_grad - numeric_grad)
+    scale = np.maximum(np.maximum(np.abs(analytic_grad), np.abs(numeric_grad)), 1e-10)
+    errors = abs_err / scale
 
     print(f"Relative errors:   {[f'{e:.2e}' for e in errors]}")
 
-    max_error = max(errors)
+    max_error = float(errors.max())
 
     if max_error < threshold:
         print(f"✅ PASS: max relative error = {max_error:.2e} < {threshold}")
@@ -101,6 +149,30 @@ def test_gradient(name: str, problem, w: np.ndarray, threshold: float = 1e-4) ->
         return False
 
 
+def test_complex_objective(name: str, problem_class, dataset_path: str, n_points: int = 5) -> bool:
+    """Test that complex_objective(w).real is objective(w) at random w, for several λ."""
+    print(f"\n=== Testing {name} complex_objective ===")
+
+    rng = np.random.default_rng(0)
+    max_error = 0.0
+    for lambda_reg in (0.0, 0.1, 10.0):
+        problem = problem_class(dataset_path, lambda_reg)
+        for w in rng.normal(scale=3.0, size=(n_points, 3)):
+            shipped_loss = problem.objective(w)
+            complex_loss = problem.complex_objective(w.astype(np.complex128)).real
+            error = abs(complex_loss - shipped_loss) / max(abs(shipped_loss), 1e-10)
+            max_error = max(max_error, error)
+            if error >= 1e-12:
+                print(f"λ = {lambda_reg}, w = {w}: complex {complex_loss:.17g} != objective {shipped_loss:.17g}")
+
+    if max_error < 1e-12:
+        print(f"✅ PASS: max relative error = {max_error:.2e} < 1e-12")
+        return True
+    else:
+        print(f"❌ FAIL: max relative error = {max_error:.2e} >= 1e-12")
+        return False
+
+
 def test_hessian(name: str, problem, w: np.ndarray, threshold: float = 1e-3) -> bool:
     """Test Hessian against numerical approximation."""
     print(f"\n=== Testing {name} Hessian ===")
@@ -111,20 +183,13 @@ def test_hessian(name: str, problem, w: np.ndarray, threshold: float = 1e-3) ->
     print(f"Analytic Hessian:\n{analytic_hessian}")
     print(f"Numeric Hessian:\n{numeric_hessian}")
 
-    # Compute relative error for each element
-    errors = []
-    n = len(w)
-    for i in range(n):
-        for j in range(n):
-            abs_error = abs(analytic_hessian[i, j] - numeric_hessian[i, j])
-            scale = max(abs(analytic_hessian[i, j]), abs(numeric_hessian[i, j]), 1e-10)
-            rel_error = abs_error / scale
-            errors.append(rel_error)
-
-    error_matrix = np.array(errors).reshape(n, n)
+    # Relative error for each element
+    abs_err = np.abs(analytic_hessian - numeric_hessian)
+    scale = np.maximum(np.maximum(np.abs(analytic_hessian), np.abs(numeric_hessian)), 1e-10)
+    error_matrix = abs_err / scale
     print(f"Relative errors:\n{error_matrix}")
 
-    max_error = max(errors)
+    max_error = float(error_matrix.max())
 
     if max_error < threshold:
         print(f"✅ PASS: max relative error = {max_error:.2e} < {threshold}")
@@ -157,6 +222,8 @@ def main():
 
     # Test Logistic Regression
     lr = LogisticRegression(str(dataset_path), lambda_reg)
+    results.append(("Logistic Regression complex_objective",
+                    test_complex_objective("Logistic Regression", LogisticRegression, str(dataset_path))))
     results.append(("Logistic Regression Gradient", test_gradient("Logistic Regression", lr, w_test)))
     results.append(("Logistic Regression Hessian", test_hessian("Logistic Regression", lr, w_test)))
 
@@ -172,6 +239,8 @@ def main():
 
     # Test Squared-Hinge SVM
     squared = SquaredHingeSVM(str(dataset_path), lambda_reg)
+    results.append(("Squared-Hinge SVM complex_objective",
+                    test_complex_objective("Squared-Hinge SVM", SquaredHingeSVM, str(dataset_path))))
     results.append(("Squared-Hinge SVM Gradient", test_gradient("Squared-Hinge SVM", squared, w_test)))
     results.append(("Squared-Hinge SVM Hessian", test_hessian("Squared-Hinge SVM", squared, w_test)))
 
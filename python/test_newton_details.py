@@ -9,12 +9,16 @@ init = np.array([0.5, 0.5, 0.0])
 # Track iterations
 iteration_data = []
 
-def callback(xk):
-    loss = problem.objective(xk)
-    grad = problem.gradient(xk)
+def callback(intermediate_result):
+    # scipy passes the loss it already computed at xk; only the gradient norm is extra
+    xk = intermediate_result.x
+    loss = intermediate_result.fun
+    grad = getattr(intermediate_result, 'jac', None)
+    if grad is None:
+        grad = problem.gradient(xk)
     grad_norm = np.linalg.norm(grad)
     iteration_data.append({
-        'x': xk.copy(),
+        'x': np.array(xk),
         'loss': loss,
         'grad_norm': grad_norm
     })
@@ -1,7 +1,17 @@
-"""Test perceptron with Newton from different initial points."""
+"""Test perceptron with Newton from different initial points.
+
+Uses damped_newton with the perceptron's constant Hessian. On the
+piecewise-linear loss the tiny curvature (lambda) makes every full Newton
+step far too long, so from most starts Newton stalls short of a minimum:
+the runs stop on the xtol step-length test and report Converged: False with
+a large gradient norm, showing where Newton gets stuck.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
-from scipy.optimize import minimize
 from data_problems import PerceptronSVM
+from newton_fast import damped_newton
 
 # Load perceptron problem
 problem = PerceptronSVM('datasets/crescent.json', lambda_reg=0.0001)
@@ -15,22 +25,31 @@ initial_points = [
     ([-0.5, -0.5, 0.0], "-0.5,-0.5,0"),
 ]
 
-print("=" * 70)
-print("Testing Perceptron + Newton from different initial points")
-print("=" * 70)
-
-for init, label in initial_points:
-    result = minimize(
+def _solve(init):
+    """One independent Newton solve (top-level so worker processes can run it)."""
+    return damped_newton(
         problem.objective,
+        problem.gradient,
+        problem.constant_hessian(),
         np.array(init),
-        method='Newton-CG',
-        jac=problem.gradient,
-        options={'maxiter': 100, 'disp': False}
+        tol=1e-6,  # Only the basin matters here, not the last digits of w
+        xtol=1e-5  # Stop (unconverged) once Newton stalls
     )
-    
-    print(f"\nInitial: {label:15s} {init}")
-    print(f"  Converged: {result.success}")
-    print(f"  Iterations: {result.nit}")
-    print(f"  Final loss: {result.fun:.6e}")
-    print(f"  Final position: [{result.x[0]:.4f}, {result.x[1]:.4f}, {result.x[2]:.4f}]")
-    print(f"  Gradient norm: {np.linalg.norm(result.jac):.2e}")
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("Testing Perceptron + Newton from different initial points")
+    print("=" * 70)
+
+    # The solves are independent, so run them in parallel; map keeps the output order
+    with ProcessPoolExecutor(max_workers=min(len(initial_points), os.cpu_count() or 1)) as ex:
+        results = list(ex.map(_solve, [init for init, _ in initial_points]))
+
+    for (init, label), result in zip(initial_points, results):
+        print(f"\nInitial: {label:15s} {init}")
+        print(f"  Converged: {result.success} ({result.message})")
+        print(f"  Iterations: {result.nit}")
+        print(f"  Final loss: {result.fun:.6e}")
+        print(f"  Final position: [{result.x[0]:.4f}, {result.x[1]:.4f}, {result.x[2]:.4f}]")
+        print(f"  Gradient norm: {np.linalg.norm(result.jac):.2e}")
@@ -20,8 +20,16 @@ print("Perceptron Hessian Analysis")
 print("=" * 70)
 print(f"\nTheoretical Hessian (from perceptronHessian()):")
 print(H_theoretical)
-print(f"\nEigenvalues: {np.linalg.eigvals(H_theoretical)}")
-print(f"Condition number: {np.linalg.cond(H_theoretical):.2e}")
+# H is diagonal, so its eigenvalues are the diagonal and cond = max|d| / min|d|
+d = np.diag(H_theoretical)
+if np.count_nonzero(H_theoretical - np.diag(d)) == 0:
+    eigenvalues = d
+    condition_number = np.max(np.abs(d)) / np.min(np.abs(d))
+else:
+    eigenvalues = np.linalg.eigvals(H_theoretical)
+    condition_number = np.linalg.cond(H_theoretical)
+print(f"\nEigenvalues: {eigenvalues}")
+print(f"Condition number: {condition_number:.2e}")
 
 # Compute gradient and theoretical Newton step
 grad = problem.gradient(w)
@@ -29,9 +37,8 @@ print(f"\n\nAt w=[{w[0]}, {w[1]}, {w[2]}]:")
 print(f"  Gradient: {grad}")
 print(f"  Gradient norm: {np.linalg.norm(grad):.2e}")
 
-# Newton direction: p = -H^{-1} @ g
-H_inv = np.linalg.inv(H_theoretical)
-newton_dir = -H_inv @ grad
+# Newton direction: solve H p = -g (no explicit inverse)
+newton_dir = np.linalg.solve(H_theoretical, -grad)
 
 print(f"\n  Newton direction: {newton_dir}")
 print(f"  Newton direction norm: {np.linalg.norm(newton_dir):.2e}")
@@ -51,9 +58,8 @@ print(f"    Loss change: {loss_after - loss_before:.6e}")
 # Now try with damping
 print(f"\n\nWith Hessian damping = 0.01:")
 H_damped = H_theoretical + 0.01 * np.eye(3)
-print(f"  Damped eigenvalues: {np.linalg.eigvals(H_damped)}")
-H_damped_inv = np.linalg.inv(H_damped)
-newton_dir_damped = -H_damped_inv @ grad
+print(f"  Damped eigenvalues: {eigenvalues + 0.01}")  # A shift by 0.01·I shifts every eigenvalue
+newton_dir_damped = np.linalg.solve(H_damped, -grad)
 print(f"  Damped Newton direction: {newton_dir_damped}")
 print(f"  Damped direction norm: {np.linalg.norm(newton_dir_damped):.2e}")
 print(f"  Ratio (||damped|| / ||grad||): {np.linalg.norm(newton_dir_damped) / np.linalg.norm(grad):.2e}")
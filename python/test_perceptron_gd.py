@@ -1,4 +1,7 @@
 """Test perceptron with different algorithms from [0.5, 0.5, 0]."""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 from scipy.optimize import minimize
 from data_problems import PerceptronSVM
@@ -13,11 +16,10 @@ algorithms = [
     ('L-BFGS-B', {}),
 ]
 
-print("Testing from [0.5, 0.5, 0] with different algorithms:")
-print("=" * 70)
-
-for method, options in algorithms:
-    result = minimize(
+def _solve(algorithm):
+    """One solve from init (top-level so worker processes can run it)."""
+    method, options = algorithm
+    return minimize(
         problem.objective,
         init.copy(),
         method=method,
@@ -25,8 +27,18 @@ for method, options in algorithms:
         options={'maxiter': 100, 'disp': False, **options}
     )
 
-    print(f"\n{method:12s}:")
-    print(f"  Converged: {result.success}")
-    print(f"  Iterations: {result.nit}")
-    print(f"  Final loss: {result.fun:.6e}")
-    print(f"  Gradient norm: {np.linalg.norm(result.jac):.2e}")
+
+if __name__ == '__main__':
+    print("Testing from [0.5, 0.5, 0] with different algorithms:")
+    print("=" * 70)
+
+    # The methods run independently, so solve them in parallel; map keeps the output order
+    with ProcessPoolExecutor(max_workers=min(len(algorithms), os.cpu_count() or 1)) as ex:
+        results = list(ex.map(_solve, algorithms))
+
+    for (method, _), result in zip(algorithms, results):
+        print(f"\n{method:12s}:")
+        print(f"  Converged: {result.success}")
+        print(f"  Iterations: {result.nit}")
+        print(f"  Final loss: {result.fun:.6e}")
+        print(f"  Gradient norm: {np.linalg.norm(result.jac):.2e}")
@@ -6,12 +6,29 @@ This test investigates numerical stability and convergence behavior
 of Newton's method on the perceptron objective.
 """
 
+import contextlib
+import io
+import multiprocessing
+import os
 import numpy as np
+import re
 import subprocess
+import sys
 import json
 from pathlib import Path
 from data_problems import PerceptronSVM
 from scipy_runner import run_scipy_optimizer
+from ts_runner import REPO_ROOT, TS_COMMAND, TS_QUIET_ENV, find_json_result, parse_ts_json
+
+# Dataset locations, resolved once
+DATASETS_DIR = REPO_ROOT / 'python' / 'datasets'
+CRESCENT_PATH = str(DATASETS_DIR / 'crescent.json')
+
+# Patterns for scraping the human-readable CLI report (compiled once)
+_RE_LOSS = re.compile(r'Final loss:\s*([\d.e+-]+)')
+_RE_GRAD = re.compile(r'Gradient norm:\s*([\d.e+-]+)')
+_RE_ITER = re.compile(r'Iteration (\d+)')
+_RE_POS = re.compile(r'Position:\s*\[([-\d.e+, ]+)\]')
 
 
 def run_ts_newton(initial: list, lambda_reg: float, dataset: str, max_iter: int = 100) -> dict:
@@ -19,37 +36,51 @@ def run_ts_newton(initial: list, lambda_reg: float, dataset: str, max_iter: int
     initial_str = ",".join(map(str, initial))
 
     cmd = [
-        'npm', 'run', 'test-combo', '--',
+        *TS_COMMAND,
         '--problem', 'separating-hyperplane',
         '--variant', 'perceptron',
         '--algorithm', 'newton',
         '--initial', initial_str,
         '--lambda', str(lambda_reg),
         '--maxIter', str(max_iter),
-        '--dataset', dataset
+        '--dataset', dataset,
+        '--format', 'json'
     ]
 
     try:
         result = subprocess.run(
             cmd,
-            capture_output=True,
-            text=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             timeout=10,
-            cwd=Path(__file__).parent.parent
+            cwd=REPO_ROOT,
+            env=TS_QUIET_ENV
         )
 
-        # Parse output
-        output = result.stdout
+        # Parse output (bytes decoded once; the report contains emoji)
+        output = result.stdout.decode('utf-8', errors='replace')
+
+        # Structured result line, when the CLI printed one
+        json_line = find_json_result(output)
+        if json_line is not None:
+            parsed = parse_ts_json(json_line, initial)
+            return {
+                'converged': parsed['converged'],
+                'iterations': parsed['iterations'],
+                'final_loss': parsed['final_loss'],
+                'final_grad_norm': parsed['final_grad_norm'],
+                'final_w': parsed['final_w'],
+                'output': output
+            }
 
         # Extract final results
         converged = 'Converged' in output
 
         # Try to extract loss and gradient norm
-        import re
-        loss_match = re.search(r'Final loss:\s*([\d.e+-]+)', output)
-        grad_match = re.search(r'Gradient norm:\s*([\d.e+-]+)', output)
-        iter_match = re.search(r'Iteration (\d+)', output)
-        pos_match = re.search(r'Position:\s*\[([-\d.e+, ]+)\]', output)
+        loss_match = _RE_LOSS.search(output)
+        grad_match = _RE_GRAD.search(output)
+        iter_match = _RE_ITER.search(output)
+        pos_match = _RE_POS.search(output)
 
         final_loss = float(loss_match.group(1)) if loss_match else np.inf
         final_grad = float(grad_match.group(1)) if grad_match else np.inf
@@ -58,7 +89,7 @@ def run_ts_newton(initial: list, lambda_reg: float, dataset: str, max_iter: int
         final_w = None
         if pos_match:
             pos_str = pos_match.group(1)
-            final_w = np.array([float(x.strip()) for x in pos_str.split(',')])
+            final_w = np.fromstring(pos_str.strip(), sep=',', dtype=np.float64)
 
         return {
             'converged': converged,
@@ -103,10 +134,12 @@ def test_starting_point(initial: np.ndarray, problem, lambda_reg: float, dataset
     print(f"  Final w: {py_result['final_w']}")
 
     # Show iteration trajectory
-    if len(py_result['iteration_history']) > 0:
+    # The history is column-oriented (loss / grad_norm arrays), so read the columns directly
+    history = py_result['iteration_history']
+    if len(history) > 0:
         print(f"\n  First 5 iterations:")
-        for it in py_result['iteration_history'][:5]:
-            print(f"    Iter {it['iter']}: loss={it['loss']:.6e}, grad_norm={it['grad_norm']:.6e}")
+        for i in range(min(5, len(history))):
+            print(f"    Iter {i}: loss={history.loss[i]:.6e}, grad_norm={history.grad_norm[i]:.6e}")
 
     # TypeScript Newton
     print("\nTypeScript Newton:")
@@ -159,16 +192,26 @@ def test_starting_point(initial: np.ndarray, problem, lambda_reg: float, dataset
     return False
 
 
+def _test_point_worker(args: tuple) -> tuple[bool, str]:
+    """Run test_starting_point in a pool worker, returning (success, printed report).
+
+    The report is captured so the parent can print all points in order.
+    """
+    initial, lambda_reg, dataset_path = args
+    problem = PerceptronSVM(dataset_path, lambda_reg)
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        success = test_starting_point(np.array(initial), problem, lambda_reg, dataset_path)
+    return success, buffer.getvalue()
+
+
 def main():
-    dataset_path = Path(__file__).parent / "datasets" / "crescent.json"
     lambda_reg = 0.1
 
-    problem = PerceptronSVM(str(dataset_path), lambda_reg)
-
     print("="*70)
     print("PERCEPTRON NEWTON STABILITY TEST")
     print("="*70)
-    print(f"Dataset: {dataset_path.name}")
+    print(f"Dataset: {Path(CRESCENT_PATH).name}")
     print(f"Lambda: {lambda_reg}")
     print(f"Problem: Perceptron with regularization")
     print()
@@ -185,10 +228,19 @@ def main():
         np.array([-5.0, -5.0, -5.0]),  # Negative values
     ]
 
+    # Starting points are independent, so run them in parallel; imap keeps the order.
+    # On Linux the workers are forked, inheriting the already-imported scipy/numpy
+    # (and warmed numba kernels) instead of re-importing them as 'spawn' would.
+    # Elsewhere the platform default is kept (fork is unsafe on macOS).
+    ctx = multiprocessing.get_context('fork' if sys.platform.startswith('linux') else None)
+    jobs = [(tuple(x), lambda_reg, CRESCENT_PATH) for x in test_points]
+    with ctx.Pool(processes=min(len(jobs), os.cpu_count() or 1)) as pool:
+        outcomes = list(pool.imap(_test_point_worker, jobs))
+
     results = []
-    for i, initial in enumerate(test_points, 1):
+    for i, (success, report) in enumerate(outcomes, 1):
         print(f"\n\nTEST {i}/{len(test_points)}")
-        success = test_starting_point(initial, problem, lambda_reg, str(dataset_path))
+        print(report, end='')
         results.append(success)
 
     # Summary
@@ -1,10 +1,109 @@
 """TypeScript CLI integration."""
 
+import atexit
+import itertools
+import json
+import math
+import os
+import select
 import subprocess
 import re
+import tempfile
+import threading
+import time
 import numpy as np
+from pathlib import Path
 from typing import Optional
 
+# Run the test-combo CLI with node + the tsx loader directly, skipping the
+# npm wrapper process and the separate node process the tsx binary spawns
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TS_ENTRY = str(REPO_ROOT / 'scripts' / 'test-combinations.ts')
+TS_COMMAND = ['node', '--import', 'tsx', TS_ENTRY]
+TS_ENV = {**os.environ, 'NODE_NO_WARNINGS': '1'}  # Keep node's startup warnings out of the output
+TS_QUIET_ENV = {**TS_ENV, 'QUIET': '1'}  # CLI prints only the result block
+
+# Patterns for scraping the human-readable CLI report (compiled once)
+_RE_ITERS = re.compile(r'in (\d+) iterations?|after (\d+) iterations?|Iterations:\s*(\d+)')
+_RE_LOSS = re.compile(r'Final loss:\s*(\S+)')
+_RE_GRAD = re.compile(r'Final grad norm:\s*(\S+)')
+_RE_POS = re.compile(r'Final position:\s*\[(.*?)\]', re.DOTALL)
+
+
+# Long-lived `--server` CLI process, shared by all calls in this process
+_ts_server: Optional[subprocess.Popen] = None
+_ts_server_lock = threading.Lock()
+_ts_server_buffer = b''  # Server output read but not yet consumed as whole lines
+_ts_request_ids = itertools.count()
+
+
+def _get_ts_server() -> subprocess.Popen:
+    """Start the TS server on first use (or after it exits)."""
+    global _ts_server, _ts_server_buffer
+    if _ts_server is None or _ts_server.poll() is not None:
+        # Binary and unbuffered: replies are read straight from the pipe
+        _ts_server = subprocess.Popen(
+            [*TS_COMMAND, '--server'],
+            cwd=REPO_ROOT,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0
+        )
+        _ts_server_buffer = b''
+    return _ts_server
+
+
+def _read_ts_reply(server: subprocess.Popen, request_id: int, timeout: float) -> Optional[str]:
+    """The server's result line for request_id, or None if the server exits first.
+
+    Reads the raw pipe with a deadline, so a partial line or a stalled server
+    cannot block past timeout (raises TimeoutError). Lines that are not this
+    request's reply (stray output, replies to abandoned requests) are skipped.
+    """
+    global _ts_server_buffer
+    deadline = time.monotonic() + timeout
+    fd = server.stdout.fileno()
+
+    while True:
+        while b'\n' in _ts_server_buffer:
+            raw, _ts_server_buffer = _ts_server_buffer.split(b'\n', 1)
+            line = raw.decode('utf-8', errors='replace')
+            if not line.startswith('{'):
+                continue
+            try:
+                reply = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(reply, dict) and reply.get('id') == request_id:
+                return line
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError
+        ready, _, _ = select.select([fd], [], [], remaining)
+        if not ready:
+            raise TimeoutError
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            return None  # Server exited
+        _ts_server_buffer += chunk
+
+
+def _stop_ts_server():
+    """Close the server's stdin so it exits, killing it if it does not."""
+    global _ts_server
+    if _ts_server is not None and _ts_server.poll() is None:
+        _ts_server.stdin.close()
+        try:
+            _ts_server.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            _ts_server.kill()
+    _ts_server = None
+
+
+atexit.register(_stop_ts_server)
+
 
 def run_typescript_test(
     problem: str,
@@ -16,48 +115,159 @@ def run_typescript_test(
     variant: Optional[str] = None,
     timeout: int = 30
 ) -> dict:
-    """Run TypeScript CLI test and parse output."""
+    """Run a TS test through the persistent server.
 
-    # Build command
-    cmd = [
-        'npm', 'run', 'test-combo', '--',
-        '--problem', problem,
-        '--algorithm', algorithm,
-        '--initial', ','.join(str(x) for x in initial),
-        '--maxIter', str(max_iter)
+    Falls back to a one-shot CLI run (which reports the CLI's own errors)
+    if the server cannot answer.
+    """
+    config = _ts_config(problem, algorithm, initial, max_iter, alpha, lambda_reg, variant)
+
+    with _ts_server_lock:
+        line = None
+        try:
+            server = _get_ts_server()
+            request_id = next(_ts_request_ids)
+            server.stdin.write((json.dumps({**config, 'id': request_id}) + '\n').encode('utf-8'))
+            line = _read_ts_reply(server, request_id, timeout)
+        except TimeoutError:
+            server.kill()  # Abandon the stuck run; the next call starts a fresh server
+            server.wait()
+            return _error_result(initial, f'Timeout after {timeout}s')
+        except OSError:
+            pass
+
+    if line:
+        return parse_ts_json(line, initial)
+
+    return run_typescript_cli(problem, algorithm, initial, max_iter, alpha, lambda_reg, variant, timeout)
+
+
+def run_typescript_batch(cases: list[dict], timeout: int = 300) -> Optional[list[dict]]:
+    """Run many TS tests in one CLI process via a --batch JSON manifest.
+
+    Each case holds run_typescript_test's keyword arguments. Returns one
+    result per case, or None if the batch run fails (callers should then
+    fall back to per-case runs).
+    """
+    configs = [
+        _ts_config(c['problem'], c['algorithm'], c['initial'], c['max_iter'],
+                   c.get('alpha'), c.get('lambda_reg'), c.get('variant'))
+        for c in cases
     ]
 
-    # Add optional parameters
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as manifest:
+        json.dump(configs, manifest)
+
+    try:
+        result = subprocess.run(
+            [*TS_COMMAND, '--batch', manifest.name],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=timeout,
+            cwd=REPO_ROOT,
+            env=TS_QUIET_ENV
+        )
+    except subprocess.TimeoutExpired:
+        return None
+    finally:
+        os.unlink(manifest.name)
+
+    lines = [line for line in result.stdout.decode('utf-8', errors='replace').splitlines() if line.startswith('{')]
+    if result.returncode != 0 or len(lines) != len(cases):
+        return None
+
+    return [parse_ts_json(line, c['initial']) for line, c in zip(lines, cases)]
+
+
+def _ts_config(
+    problem: str,
+    algorithm: str,
+    initial: list[float],
+    max_iter: int,
+    alpha: Optional[float],
+    lambda_reg: Optional[float],
+    variant: Optional[str]
+) -> dict:
+    """TestConfig JSON for the server and batch modes (unset options are omitted)."""
+    config = {'problem': problem, 'algorithm': algorithm, 'initialPoint': list(initial), 'maxIter': max_iter}
     if alpha is not None:
-        cmd.extend(['--alpha', str(alpha)])
+        config['alpha'] = alpha
     if lambda_reg is not None:
-        cmd.extend(['--lambda', str(lambda_reg)])
+        config['lambda'] = lambda_reg
     if variant is not None:
-        cmd.extend(['--variant', variant])
+        config['variant'] = variant
+    return config
+
+
+def _error_result(initial: list[float], message: str) -> dict:
+    """Result dict for a TS run that produced no output."""
+    return {
+        'converged': False,
+        'iterations': 0,
+        'final_loss': np.inf,
+        'final_w': np.array(initial),
+        'final_grad_norm': np.inf,
+        'message': message,
+        'raw_output': ''
+    }
+
+
+def run_typescript_cli(
+    problem: str,
+    algorithm: str,
+    initial: list[float],
+    max_iter: int,
+    alpha: Optional[float] = None,
+    lambda_reg: Optional[float] = None,
+    variant: Optional[str] = None,
+    timeout: int = 30
+) -> dict:
+    """Run TypeScript CLI test in a fresh process and parse output."""
+
+    # Build command; optional parameters are passed only when set
+    optional = {'--alpha': alpha, '--lambda': lambda_reg, '--variant': variant}
+    extras = [arg for flag, value in optional.items() if value is not None for arg in (flag, str(value))]
+    cmd = [
+        *TS_COMMAND,
+        '--problem', problem,
+        '--algorithm', algorithm,
+        '--initial', ','.join(str(x) for x in initial),
+        '--maxIter', str(max_iter),
+        '--format', 'json',
+        *extras
+    ]
 
     # Run command
     try:
+        # stderr is only needed for diagnostics, so it is discarded on the happy path
         result = subprocess.run(
             cmd,
-            capture_output=True,
-            text=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             timeout=timeout,
-            cwd='/Users/eph/newtons-method'
+            cwd=REPO_ROOT,
+            env=TS_QUIET_ENV
         )
+        # Capture bytes and decode once (the report contains emoji, so utf-8)
+        stdout = result.stdout.decode('utf-8', errors='replace')
 
         if result.returncode != 0:
-            print(f"TypeScript CLI returned non-zero exit code: {result.returncode} with output:\n{result.stdout}\n{result.stderr}")
+            # Re-run once with stderr captured to report the failure
+            result = subprocess.run(cmd, capture_output=True, timeout=timeout, cwd=REPO_ROOT, env=TS_ENV)
+            stdout = result.stdout.decode('utf-8', errors='replace')
+            stderr = result.stderr.decode('utf-8', errors='replace')
+            print(f"TypeScript CLI returned non-zero exit code: {result.returncode} with output:\n{stdout}\n{stderr}")
             return {
                 'converged': False,
                 'iterations': 0,
                 'final_loss': np.inf,
                 'final_w': np.array(initial),
                 'final_grad_norm': np.inf,
-                'message': f'CLI error: {result.stderr}',
-                'raw_output': result.stdout
+                'message': f'CLI error: {stderr}',
+                'raw_output': stdout
             }
 
-        return parse_ts_output(result.stdout, initial)
+        return parse_ts_output(stdout, initial)
 
     except subprocess.TimeoutExpired:
         return {
@@ -82,9 +292,55 @@ def run_typescript_test(
         }
 
 
+def parse_ts_json(line: str, initial: list[float]) -> dict:
+    """Parse one JSON result line from the TS server (null marks NaN/Infinity)."""
+    try:
+        obj = json.loads(line)
+
+        final_loss = np.inf if obj['final_loss'] is None else float(obj['final_loss'])
+        final_grad_norm = np.inf if obj['final_grad_norm'] is None else float(obj['final_grad_norm'])
+        if obj['final_w'] is not None:
+            final_w = np.asarray(obj['final_w'], dtype=np.float64)
+        else:
+            final_w = np.array(initial)
+
+        return {
+            'converged': bool(obj['converged'] and np.isfinite(final_loss) and np.isfinite(final_grad_norm)),
+            'iterations': int(obj['iterations']),
+            'final_loss': final_loss,
+            'final_w': final_w,
+            'final_grad_norm': final_grad_norm,
+            'message': obj['error'] or 'Parsed from CLI JSON',
+            'raw_output': line
+        }
+
+    except Exception as e:
+        return _error_result(initial, f'Parse error: {str(e)}') | {'raw_output': line}
+
+
+def find_json_result(stdout: str) -> Optional[str]:
+    """Last line of CLI output that holds a JSON result (from --format json)."""
+    for line in reversed(stdout.splitlines()):
+        if line.startswith('{'):
+            return line
+    return None
+
+
+def _finite_or_inf(text: str) -> float:
+    """Parse a number printed by the CLI; NaN, ±Infinity and garbage become inf."""
+    try:
+        value = float(text)
+    except ValueError:
+        return np.inf
+    return value if math.isfinite(value) else np.inf
+
+
 def parse_ts_output(stdout: str, initial: list[float]) -> dict:
     """Parse TypeScript CLI output.
 
+    Uses the final JSON line when the CLI was run with --format json, and
+    otherwise falls back to scraping the human-readable report.
+
     Expected formats:
 
     Converged:
@@ -99,45 +355,30 @@ def parse_ts_output(stdout: str, initial: list[float]) -> dict:
        Final loss: 3.527540e-10
        Final grad norm: 2.95e-5
     """
+    json_line = find_json_result(stdout)
+    if json_line is not None:
+        return parse_ts_json(json_line, initial) | {'raw_output': stdout}
+
     try:
         # Check convergence
         converged = '✅ CONVERGED' in stdout
 
-        # Extract iterations - try multiple patterns
-        iter_match = re.search(r'in (\d+) iterations?', stdout)
-        if not iter_match:
-            iter_match = re.search(r'after (\d+) iterations?', stdout)
-        if not iter_match:
-            iter_match = re.search(r'Iterations:\s*(\d+)', stdout)
-        iterations = int(iter_match.group(1)) if iter_match else 0
-
-        # Extract final loss (handle NaN, Infinity)
-        loss_match = re.search(r'Final loss:\s*(\S+)', stdout)
-        if loss_match:
-            loss_str = loss_match.group(1)
-            if 'NaN' in loss_str or 'Infinity' in loss_str:
-                final_loss = np.inf
-            else:
-                final_loss = float(loss_str)
-        else:
-            final_loss = np.inf
-
-        # Extract final grad norm (handle NaN, Infinity)
-        grad_match = re.search(r'Final grad norm:\s*(\S+)', stdout)
-        if grad_match:
-            grad_str = grad_match.group(1)
-            if 'NaN' in grad_str or 'Infinity' in grad_str:
-                final_grad_norm = np.inf
-            else:
-                final_grad_norm = float(grad_str)
-        else:
-            final_grad_norm = np.inf
+        # Extract iterations - one scan over all three phrasings
+        iter_match = _RE_ITERS.search(stdout)
+        iterations = int(next(g for g in iter_match.groups() if g)) if iter_match else 0
+
+        # Extract final loss and grad norm (NaN/Infinity map to inf)
+        loss_match = _RE_LOSS.search(stdout)
+        final_loss = _finite_or_inf(loss_match.group(1)) if loss_match else np.inf
+
+        grad_match = _RE_GRAD.search(stdout)
+        final_grad_norm = _finite_or_inf(grad_match.group(1)) if grad_match else np.inf
 
         # Extract final position (optional - may not be present for non-converged cases)
-        pos_match = re.search(r'Final position:\s*\[(.*?)\]', stdout)
+        pos_match = _RE_POS.search(stdout)
         if pos_match:
             pos_str = pos_match.group(1)
-            final_w = np.array([float(x.strip()) for x in pos_str.split(',')])
+            final_w = np.fromstring(pos_str.strip(), sep=',', dtype=np.float64)
         else:
             final_w = np.array(initial)
 
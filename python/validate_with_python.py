@@ -2,14 +2,17 @@
 """Python validation suite - compares TS algorithms against scipy."""
 
 import argparse
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Optional
 import numpy as np
 
 from problems import get_problem
 from data_problems import get_data_problem
 from scipy_runner import run_scipy_optimizer
-from ts_runner import run_typescript_test
+from ts_runner import run_typescript_batch, run_typescript_test
 from comparator import compare_results, ComparisonStatus
 
 
@@ -18,6 +21,10 @@ PURE_PROBLEMS = ['quadratic', 'ill-conditioned-quadratic', 'rosenbrock', 'non-co
 ALGORITHMS = ['gd-fixed', 'gd-linesearch', 'newton', 'lbfgs']
 SVM_VARIANTS = ['soft-margin', 'perceptron', 'squared-hinge']
 
+# Dataset locations, resolved once
+DATASETS_DIR = Path(__file__).resolve().parent / 'datasets'
+CRESCENT_PATH = str(DATASETS_DIR / 'crescent.json')
+
 
 def get_test_cases() -> list[dict]:
     """Generate all test case configurations."""
@@ -87,19 +94,35 @@ def format_test_name(test_case: dict) -> str:
     return name
 
 
-def run_single_test(test_case: dict, verbose: bool = False) -> tuple[ComparisonStatus, dict]:
-    """Run a single test case comparing Python and TS."""
+def ts_arguments(test_case: dict) -> dict:
+    """run_typescript_test keyword arguments for a test case."""
+    return {
+        'problem': test_case['problem'],
+        'algorithm': test_case['algorithm'],
+        'initial': test_case['initial'],
+        'max_iter': test_case['max_iter'],
+        'alpha': test_case.get('alpha'),
+        'lambda_reg': test_case.get('lambda'),
+        'variant': test_case.get('variant')
+    }
+
+
+def run_single_test(
+    test_case: dict,
+    verbose: bool = False,
+    ts_result: Optional[dict] = None
+) -> tuple[ComparisonStatus, dict]:
+    """Run a single test case comparing Python and TS (ts_result, if given, skips the TS run)."""
 
     # Get problem instance
     if test_case['problem'] in PURE_PROBLEMS:
         problem = get_problem(test_case['problem'])
     else:
         # Data-based problem
-        dataset_path = str(Path(__file__).parent / 'datasets' / 'crescent.json')
         problem = get_data_problem(
             test_case['problem'],
             test_case.get('variant'),
-            dataset_path,
+            CRESCENT_PATH,
             test_case.get('lambda', 0.01)
         )
 
@@ -114,15 +137,8 @@ def run_single_test(test_case: dict, verbose: bool = False) -> tuple[ComparisonS
     )
 
     # Run TypeScript
-    ts_result = run_typescript_test(
-        problem=test_case['problem'],
-        algorithm=test_case['algorithm'],
-        initial=test_case['initial'],
-        max_iter=test_case['max_iter'],
-        alpha=test_case.get('alpha'),
-        lambda_reg=test_case.get('lambda'),
-        variant=test_case.get('variant')
-    )
+    if ts_result is None:
+        ts_result = run_typescript_test(**ts_arguments(test_case))
 
     # Compare
     status, details = compare_results(python_result, ts_result, test_case['problem'])
@@ -217,49 +233,65 @@ def main():
     print(f"Running {len(test_cases)} test cases...")
     print(f"{'='*60}\n")
 
-    for test_case in test_cases:
-        test_name = format_test_name(test_case)
-
-        if not args.quiet:
-            print(f"\nTesting: {test_name}...", end='', flush=True)
+    # All TS runs in one CLI process; a single filtered case (or a failed
+    # batch) falls back to per-case runs inside run_single_test
+    ts_results = None
+    if len(test_cases) > 1:
+        ts_results = run_typescript_batch([ts_arguments(tc) for tc in test_cases])
+    if ts_results is None:
+        ts_results = [None] * len(test_cases)
+
+    # Test cases are independent (each spends most of its time in the TS
+    # subprocess), so run them in parallel; results are still reported in order
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [
+            executor.submit(run_single_test, tc, args.verbose, ts)
+            for tc, ts in zip(test_cases, ts_results)
+        ]
+
+        for test_case, future in zip(test_cases, futures):
+            test_name = format_test_name(test_case)
 
-        try:
-            status, details, py_result, ts_result = run_single_test(test_case, args.verbose)
-
-            # Store result
-            result_entry = {
-                'test_name': test_name,
-                'test_case': test_case,
-                'status': status,
-                'details': details,
-                'python_result': py_result,
-                'ts_result': ts_result
-            }
-
-            if status == ComparisonStatus.PASS:
-                results['pass'].append(result_entry)
-            elif status == ComparisonStatus.SUSPICIOUS:
-                results['suspicious'].append(result_entry)
-            else:
-                results['fail'].append(result_entry)
-
-            # Print result
             if not args.quiet:
-                print(f" {status.value}")
-                if args.verbose or status != ComparisonStatus.PASS:
-                    print_test_result(test_name, status, details, args.verbose)
-
-        except Exception as e:
-            print(f"\n❌ ERROR: {test_name}")
-            print(f"   {str(e)}")
-            results['fail'].append({
-                'test_name': test_name,
-                'test_case': test_case,
-                'status': ComparisonStatus.FAIL,
-                'details': {'issues': [f'Exception: {str(e)}']},
-                'python_result': None,
-                'ts_result': None
-            })
+                print(f"\nTesting: {test_name}...", end='', flush=True)
+
+            try:
+                status, details, py_result, ts_result = future.result()
+
+                # Store result
+                result_entry = {
+                    'test_name': test_name,
+                    'test_case': test_case,
+                    'status': status,
+                    'details': details,
+                    'python_result': py_result,
+                    'ts_result': ts_result
+                }
+
+                if status == ComparisonStatus.PASS:
+                    results['pass'].append(result_entry)
+                elif status == ComparisonStatus.SUSPICIOUS:
+                    results['suspicious'].append(result_entry)
+                else:
+                    results['fail'].append(result_entry)
+
+                # Print result
+                if not args.quiet:
+                    print(f" {status.value}")
+                    if args.verbose or status != ComparisonStatus.PASS:
+                        print_test_result(test_name, status, details, args.verbose)
+
+            except Exception as e:
+                print(f"\n❌ ERROR: {test_name}")
+                print(f"   {str(e)}")
+                results['fail'].append({
+                    'test_name': test_name,
+                    'test_case': test_case,
+                    'status': ComparisonStatus.FAIL,
+                    'details': {'issues': [f'Exception: {str(e)}']},
+                    'python_result': None,
+                    'ts_result': None
+                })
 
     # Print summary
     print_summary(results)
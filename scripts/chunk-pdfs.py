@@ -4,25 +4,57 @@ PDF Chunking System
 
 Extracts text from OCR'd PDFs and splits them into manageable chunks
 for agent processing, preserving page numbers for accurate citations.
+
+Text extraction prefers the `pdftotext` Python binding (`uv pip install
+pdftotext`, which needs the poppler headers), then the poppler-utils
+`pdftotext` binary, then pypdf.
 """
 
+import argparse
+import functools
+import gc
 import json
 import os
 import re
 import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Tuple
+
+try:
+    import pdftotext
+    PDFTOTEXT_LIB_AVAILABLE = True
+except ImportError:
+    PDFTOTEXT_LIB_AVAILABLE = False
+
+# orjson is optional; it serializes the index several times faster
+try:
+    import orjson
+
+    def _dumps(data) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _dumps(data) -> bytes:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
 
 # Configuration
 PAGES_PER_CHUNK = 10
 REFERENCES_DIR = Path("docs/references")
 CHUNKS_DIR = REFERENCES_DIR / "chunks"
 INDEX_FILE = REFERENCES_DIR / "chunk-index.json"
+PAGE_SEPARATOR = "=" * 80
+CHUNK_WRITE_THREADS = 8
+
+# Filename sanitizing patterns (compiled once)
+_SANITIZE_NON_WORD = re.compile(r'[^\w\-_]')
+_SANITIZE_MULTI_UNDERSCORE = re.compile(r'_+')
 
 
 def has_pdftotext() -> bool:
-    """Check if pdftotext (poppler) is available."""
+    """Check if pdftotext (poppler) is available, as the Python binding or the binary."""
+    if PDFTOTEXT_LIB_AVAILABLE:
+        return True
     try:
         subprocess.run(["pdftotext", "-v"], capture_output=True, check=True)
         return True
@@ -31,40 +63,35 @@ def has_pdftotext() -> bool:
 
 
 def extract_text_with_poppler(pdf_path: Path) -> Dict[int, str]:
-    """Extract text from PDF using poppler's pdftotext, one page at a time."""
-    pages = {}
+    """
+    Extract text from PDF using poppler's pdftotext.
 
-    # Get page count first
+    The whole document is converted in one call; pdftotext ends every page
+    with a form feed, so the output is split on those.
+    """
     result = subprocess.run(
-        ["pdfinfo", str(pdf_path)],
+        ["pdftotext", "-layout", str(pdf_path), "-"],
         capture_output=True,
-        text=True,
         check=True
     )
 
-    page_count = 0
-    for line in result.stdout.split('\n'):
-        if line.startswith('Pages:'):
-            page_count = int(line.split(':')[1].strip())
-            break
+    page_texts = result.stdout.decode('utf-8', errors='replace').split('\x0c')
+    if page_texts and page_texts[-1] == "":
+        page_texts.pop()  # Empty remainder after the final form feed
 
-    print(f"  Extracting {page_count} pages...")
+    print(f"  Extracted {len(page_texts)} pages")
 
-    # Extract each page
-    for page_num in range(1, page_count + 1):
-        result = subprocess.run(
-            ["pdftotext", "-f", str(page_num), "-l", str(page_num),
-             "-layout", str(pdf_path), "-"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        pages[page_num] = result.stdout
+    return {page_num: text for page_num, text in enumerate(page_texts, start=1)}
 
-        if page_num % 50 == 0:
-            print(f"    Processed {page_num}/{page_count} pages...")
 
-    return pages
+def extract_text_with_pdftotext_lib(pdf_path: Path) -> Dict[int, str]:
+    """Extract text from PDF in-process using the pdftotext Python binding."""
+    with open(pdf_path, "rb") as f:
+        pdf = pdftotext.PDF(f, physical=True)  # physical=True matches -layout
+
+    print(f"  Extracted {len(pdf)} pages")
+
+    return {page_num: pdf[page_num - 1] for page_num in range(1, len(pdf) + 1)}
 
 
 def extract_text_with_pypdf(pdf_path: Path) -> Dict[int, str]:
@@ -89,13 +116,13 @@ def extract_text_with_pypdf(pdf_path: Path) -> Dict[int, str]:
     return pages
 
 
-def chunk_pages(pages: Dict[int, str], chunk_size: int) -> List[Tuple[int, int, str]]:
+def chunk_pages(pages: Dict[int, str], chunk_size: int) -> Iterator[Tuple[int, int, List[str]]]:
     """
-    Split pages into chunks.
+    Split pages into chunks, one at a time.
 
-    Returns: List of (start_page, end_page, combined_text) tuples
+    Yields: (start_page, end_page, parts) tuples, where joining parts gives
+    the chunk text (page headers interleaved with page text)
     """
-    chunks = []
     page_nums = sorted(pages.keys())
 
     for i in range(0, len(page_nums), chunk_size):
@@ -103,77 +130,132 @@ def chunk_pages(pages: Dict[int, str], chunk_size: int) -> List[Tuple[int, int,
         start_page = chunk_pages[0]
         end_page = chunk_pages[-1]
 
-        # Combine text from all pages in chunk, preserving page boundaries
-        combined_text = ""
+        # Header and text for each page in chunk, preserving page boundaries
+        parts = []
         for page_num in chunk_pages:
-            combined_text += f"\n{'='*80}\n"
-            combined_text += f"PAGE {page_num}\n"
-            combined_text += f"{'='*80}\n\n"
-            combined_text += pages[page_num]
-
-        chunks.append((start_page, end_page, combined_text))
+            parts.append(f"\n{PAGE_SEPARATOR}\nPAGE {page_num}\n{PAGE_SEPARATOR}\n\n")
+            parts.append(pages[page_num])
 
-    return chunks
+        yield start_page, end_page, parts
 
 
+@functools.lru_cache(maxsize=4096)
 def sanitize_filename(name: str) -> str:
     """Convert filename to safe format."""
     # Remove extension and sanitize
     name = Path(name).stem
-    name = re.sub(r'[^\w\-_]', '_', name)
-    name = re.sub(r'_+', '_', name)
+    name = _SANITIZE_NON_WORD.sub('_', name)
+    name = _SANITIZE_MULTI_UNDERSCORE.sub('_', name)
     return name.lower()
 
 
-def process_pdf(pdf_path: Path, use_poppler: bool) -> Dict:
+def _write_chunk(chunk_path: Path, parts: List[str]) -> None:
+    """Write one chunk file from its text parts."""
+    with chunk_path.open('w', encoding='utf-8') as f:
+        f.writelines(parts)
+
+
+def process_pdf(pdf_path: Path, pdf_id: str, use_poppler: bool) -> Dict:
     """Process a single PDF and return metadata."""
     print(f"\nProcessing: {pdf_path.name}")
 
     # Extract text
-    if use_poppler:
+    if use_poppler and PDFTOTEXT_LIB_AVAILABLE:
+        pages = extract_text_with_pdftotext_lib(pdf_path)
+    elif use_poppler:
         pages = extract_text_with_poppler(pdf_path)
     else:
         pages = extract_text_with_pypdf(pdf_path)
 
-    # Create chunks
-    chunks = chunk_pages(pages, PAGES_PER_CHUNK)
-    print(f"  Created {len(chunks)} chunks")
-
-    # Save chunks
-    safe_name = sanitize_filename(pdf_path.name)
-    pdf_chunks_dir = CHUNKS_DIR / safe_name
+    # Create and save chunks; each chunk is handed to a writer thread as it is
+    # built, so its parts are released once written (writing is I/O-bound and
+    # releases the GIL, so the writes overlap)
+    pdf_chunks_dir = CHUNKS_DIR / pdf_id
     pdf_chunks_dir.mkdir(parents=True, exist_ok=True)
 
     chunk_files = []
-    for start_page, end_page, text in chunks:
-        chunk_filename = f"{safe_name}_pages_{start_page:04d}-{end_page:04d}.txt"
-        chunk_path = pdf_chunks_dir / chunk_filename
+    with ThreadPoolExecutor(max_workers=CHUNK_WRITE_THREADS) as executor:
+        writes = []
+        for start_page, end_page, parts in chunk_pages(pages, PAGES_PER_CHUNK):
+            chunk_filename = f"{pdf_id}_pages_{start_page:04d}-{end_page:04d}.txt"
+            writes.append(executor.submit(_write_chunk, pdf_chunks_dir / chunk_filename, parts))
 
-        chunk_path.write_text(text, encoding='utf-8')
+            chunk_files.append({
+                "file": f"chunks/{pdf_id}/{chunk_filename}",
+                "start_page": start_page,
+                "end_page": end_page,
+                "page_count": end_page - start_page + 1
+            })
 
-        chunk_files.append({
-            "file": f"chunks/{safe_name}/{chunk_filename}",
-            "start_page": start_page,
-            "end_page": end_page,
-            "page_count": end_page - start_page + 1
-        })
+        for write in writes:
+            write.result()  # Re-raise any write error
 
+    print(f"  Created {len(chunk_files)} chunks")
+
+    stat = pdf_path.stat()
     return {
         "source_file": pdf_path.name,
+        "source_mtime": stat.st_mtime,
+        "source_size": stat.st_size,
         "total_pages": max(pages.keys()),
         "chunks": chunk_files,
         "pages_per_chunk": PAGES_PER_CHUNK
     }
 
 
+def load_existing_index() -> Dict:
+    """Load the index from a previous run, or {} if there is none."""
+    if not INDEX_FILE.exists():
+        return {}
+    try:
+        with open(INDEX_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def is_up_to_date(pdf_path: Path, metadata: Dict) -> bool:
+    """Check whether an index entry still matches the PDF and its chunk files."""
+    stat = pdf_path.stat()
+    return (
+        metadata.get("source_mtime") == stat.st_mtime
+        and metadata.get("source_size") == stat.st_size
+        and metadata.get("pages_per_chunk") == PAGES_PER_CHUNK
+        and all((REFERENCES_DIR / chunk["file"]).exists() for chunk in metadata["chunks"])
+    )
+
+
+def _process_pdf_task(pdf_path: Path, pdf_id: str, use_poppler: bool) -> Tuple[str, object]:
+    """Pool task: (pdf_id, metadata), or (pdf_id, exception) if processing failed."""
+    try:
+        return pdf_id, process_pdf(pdf_path, pdf_id, use_poppler)
+    except Exception as e:
+        return pdf_id, e
+    finally:
+        gc.collect()  # Workers are reused, so free the PDF's text before the next one
+
+
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Split reference PDFs into text chunks")
+    parser.add_argument(
+        "--jobs", type=int, default=None,
+        help="Number of PDFs to process in parallel (default: one per CPU)"
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Re-chunk every PDF, even those unchanged since the last run"
+    )
+    args = parser.parse_args()
+
     print("PDF Chunking System")
     print("=" * 80)
 
     # Check for PDF processing capability
     use_poppler = has_pdftotext()
-    if use_poppler:
+    if use_poppler and PDFTOTEXT_LIB_AVAILABLE:
+        print("✓ Using poppler via the pdftotext Python binding")
+    elif use_poppler:
         print("✓ Using poppler-utils (pdftotext)")
     else:
         print("⚠ poppler-utils not found, falling back to pypdf")
@@ -190,20 +272,42 @@ def main():
     # Create chunks directory
     CHUNKS_DIR.mkdir(parents=True, exist_ok=True)
 
-    # Process each PDF
-    index = {}
-    for pdf_path in pdf_files:
-        try:
-            metadata = process_pdf(pdf_path, use_poppler)
-            index[sanitize_filename(pdf_path.name)] = metadata
-        except Exception as e:
-            print(f"  ✗ Error processing {pdf_path.name}: {e}")
-            continue
+    # PDF IDs (sanitized filenames), computed once per PDF
+    pdf_ids = {pdf_path: sanitize_filename(pdf_path.name) for pdf_path in pdf_files}
+
+    # Reuse index entries for PDFs that have not changed since the last run
+    results = {}
+    to_process = []
+    existing_index = {} if args.force else load_existing_index()
+    for pdf_path, pdf_id in pdf_ids.items():
+        if pdf_id in existing_index and is_up_to_date(pdf_path, existing_index[pdf_id]):
+            results[pdf_id] = existing_index[pdf_id]
+        else:
+            to_process.append(pdf_path)
+
+    if results:
+        print(f"Skipping {len(results)} unchanged PDFs (use --force to re-chunk)")
+
+    # Process the PDFs in parallel; each one writes to its own chunk directory
+    jobs = args.jobs or max(1, min(len(to_process), os.cpu_count() or 1))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(_process_pdf_task, pdf_path, pdf_ids[pdf_path], use_poppler): pdf_path
+            for pdf_path in to_process
+        }
+        for future in as_completed(futures):
+            pdf_id, metadata = future.result()
+            if isinstance(metadata, Exception):
+                print(f"  ✗ Error processing {futures[future].name}: {metadata}")
+                continue
+            results[pdf_id] = metadata
+
+    # Index entries keep the sorted PDF order, whatever order the jobs finished in
+    index = {pdf_id: results[pdf_id] for pdf_id in pdf_ids.values() if pdf_id in results}
 
     # Save index
     print(f"\nSaving index to {INDEX_FILE}")
-    with open(INDEX_FILE, 'w') as f:
-        json.dump(index, f, indent=2)
+    INDEX_FILE.write_bytes(_dumps(index))
 
     print("\n✓ Done!")
     print(f"\nChunks stored in: {CHUNKS_DIR}")
@@ -4,57 +4,174 @@ Utility functions for loading and saving citation data from the new split file s
 """
 
 import json
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Tuple
+
+# orjson is optional; it parses and serializes the citation files several times faster
+try:
+    import orjson
+    _loads = orjson.loads
+
+    def _dumps(data: Any) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(data: Any) -> bytes:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+CITATION_READ_THREADS = 16
+
+# Merged load_citations_data() result, reused while the source files are unchanged
+_CACHE_PATH = Path('.cache/citations_data.pickle')
+
+
+def _load_json(path: Path) -> Any:
+    """Parse one JSON file."""
+    return _loads(path.read_bytes())
+
+
+def _cache_signature(references_path: Path, citation_files: List[Path]) -> Tuple:
+    """Fingerprint of the source files: (name, mtime, size) of each one."""
+    stats = sorted((path.name, path.stat()) for path in citation_files)
+    ref_stat = references_path.stat()
+    return (
+        tuple((name, st.st_mtime_ns, st.st_size) for name, st in stats),
+        (ref_stat.st_mtime_ns, ref_stat.st_size),
+    )
+
+
+def invalidate_citations_cache() -> None:
+    """Delete the cached load_citations_data() result."""
+    try:
+        _CACHE_PATH.unlink()
+    except FileNotFoundError:
+        pass
 
 
 def load_citations_data() -> Dict[str, Any]:
     """
     Load all citations and references from the new file structure.
 
+    The merged result is cached in .cache/ and reused until a citation file
+    or references.json changes.
+
     Returns:
         Dictionary with 'references' and 'citations' keys
     """
-    # Load references
     references_path = Path('docs/references.json')
-    with open(references_path, 'r') as f:
-        references = json.load(f)
-
-    # Load all citation files
     citations_dir = Path('docs/citations')
-    citations = {}
+    citation_files = list(citations_dir.glob('*.json'))
+
+    signature = _cache_signature(references_path, citation_files)
+    try:
+        with open(_CACHE_PATH, 'rb') as f:
+            cached_signature, cached_data = pickle.load(f)
+        if cached_signature == signature:
+            return cached_data
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        pass
+
+    # Load references
+    references = _load_json(references_path)
 
-    for citation_file in citations_dir.glob('*.json'):
-        citation_key = citation_file.stem  # filename without .json
-        with open(citation_file, 'r') as f:
-            citations[citation_key] = json.load(f)
+    # Load all citation files (reads are I/O-bound, so use threads)
 
-    return {
+    with ThreadPoolExecutor(max_workers=CITATION_READ_THREADS) as executor:
+        parsed = executor.map(_load_json, citation_files)
+        # Keyed by filename without .json
+        citations = {path.stem: data for path, data in zip(citation_files, parsed)}
+
+    data = {
         'references': references,
         'citations': citations
     }
 
+    # Write the cache atomically, so a concurrent reader never sees a partial file
+    _CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = _CACHE_PATH.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as f:
+        pickle.dump((signature, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, _CACHE_PATH)
+
+    return data
+
 
-def save_citation(citation_key: str, citation_data: Dict[str, Any]) -> None:
+def _write_json(path: Path, data: Any) -> bool:
+    """
+    Write data as JSON, unless the file already holds exactly those bytes.
+
+    The new contents go to a temporary file that then replaces the original,
+    so the file is never left half-written.
+
+    Returns:
+        True if the file was rewritten
+    """
+    new_bytes = _dumps(data)
+    try:
+        if path.read_bytes() == new_bytes:
+            return False
+    except FileNotFoundError:
+        pass
+
+    tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+    tmp_path.write_bytes(new_bytes)
+    os.replace(tmp_path, path)
+    invalidate_citations_cache()
+    return True
+
+
+def save_citation(citation_key: str, citation_data: Dict[str, Any]) -> bool:
     """
     Save a single citation to its file.
 
     Args:
         citation_key: The citation identifier (filename without .json)
         citation_data: The citation data to save
+
+    Returns:
+        True if the file changed
     """
-    citation_path = Path(f'docs/citations/{citation_key}.json')
-    with open(citation_path, 'w') as f:
-        json.dump(citation_data, f, indent=2)
+    return _write_json(Path(f'docs/citations/{citation_key}.json'), citation_data)
 
 
-def save_references(references: Dict[str, Any]) -> None:
+def save_references(references: Dict[str, Any]) -> bool:
     """
     Save references to references.json.
 
     Args:
         references: The references data to save
+
+    Returns:
+        True if the file changed
     """
-    references_path = Path('docs/references.json')
-    with open(references_path, 'w') as f:
-        json.dump(references, f, indent=2)
+    return _write_json(Path('docs/references.json'), references)
+
+
+def format_ranges(pages: Iterable[int]) -> str:
+    """
+    Format page numbers into a compact spec like '8-10, 61'.
+
+    Args:
+        pages: Page numbers, in any order and possibly repeated
+
+    Returns:
+        Comma-separated pages and ranges of consecutive pages ("" if empty)
+    """
+    pages = sorted(set(pages))
+    if not pages:
+        return ""
+
+    ranges = []
+    start = end = pages[0]
+    for page in pages[1:]:
+        if page != end + 1:
+            ranges.append(f"{start}-{end}" if start != end else str(start))
+            start = page
+        end = page
+
+    ranges.append(f"{start}-{end}" if start != end else str(start))
+    return ', '.join(ranges)
@@ -21,14 +21,21 @@ Output:
 """
 
 import argparse
+import collections
+import functools
+import hashlib
 import json
+import os
 import re
+import struct
 import sys
-from datetime import datetime
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, Tuple
 
-from PIL import Image
+# PIL and datetime are imported where they are used, which keeps start-up
+# cheap for runs that exit early (--help, argument or validation errors)
+if TYPE_CHECKING:
+    from PIL import Image
 
 
 # Configuration
@@ -38,7 +45,21 @@ DEFAULT_DPI = 300
 CREATED_BY = "agent"
 MIN_CROP_SIZE = 10  # Minimum crop dimension in pixels
 
+# Decoded source pages, so repeated crops from one page skip the PNG decode
+_IMAGE_CACHE_DIR = Path(".cache/formula-crops")
+_CACHEABLE_MODES = {"1", "L", "LA", "RGB", "RGBA"}  # Modes that round-trip through tobytes()
+_IMAGE_CACHE_MAX_BYTES = 256 * 1024 * 1024  # Least recently used entries are evicted past this
 
+# Decoded pages kept in memory by --serve sessions: resolved path -> (mtime_ns, image)
+_OPEN_IMAGES = collections.OrderedDict()
+_OPEN_IMAGES_MAXSIZE = 8
+
+# Filename sanitizing patterns (compiled once)
+_SANITIZE_NON_WORD = re.compile(r'[^\w\-]')
+_SANITIZE_MULTI_UNDERSCORE = re.compile(r'_+')
+
+
+@functools.lru_cache(maxsize=4096)
 def sanitize_for_filename(text: str) -> str:
     """
     Sanitize text for use in filenames.
@@ -54,9 +75,9 @@ def sanitize_for_filename(text: str) -> str:
     # Convert to lowercase
     text = text.lower()
     # Replace spaces, parentheses, dots, and other special chars with underscore
-    text = re.sub(r'[^\w\-]', '_', text)
+    text = _SANITIZE_NON_WORD.sub('_', text)
     # Collapse multiple underscores
-    text = re.sub(r'_+', '_', text)
+    text = _SANITIZE_MULTI_UNDERSCORE.sub('_', text)
     # Remove leading/trailing underscores
     text = text.strip('_')
     return text
@@ -138,13 +159,124 @@ def validate_percentage(value: float, name: str) -> None:
         raise ValueError(f"{name} must be between 0 and 100, got {value}")
 
 
+def _image_cache_path(source_path: Path, mtime_ns: int) -> Path:
+    """Cache file for a source image, keyed by its path and modification time."""
+    key = hashlib.sha1(str(source_path.resolve()).encode() + struct.pack("Q", mtime_ns)).hexdigest()
+    return _IMAGE_CACHE_DIR / f"{key}.raw"
+
+
+def _row_stride(mode: str, width: int) -> int:
+    """Bytes per row of raw pixel data (mode "1" packs 8 pixels per byte)."""
+    if mode == "1":
+        return (width + 7) // 8
+    return width * len(mode)  # One byte per band for L, LA, RGB, RGBA
+
+
+def _prune_image_cache() -> None:
+    """Delete least recently used cache entries until the cache fits its size limit."""
+    entries = []
+    for path in _IMAGE_CACHE_DIR.glob("*.raw"):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue  # Removed by a concurrent process
+        entries.append((st.st_mtime_ns, st.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if total <= _IMAGE_CACHE_MAX_BYTES:
+            break
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def load_source_region(
+    source_path: Path,
+    box_for_size: Callable[[int, int], Tuple[int, int, int, int]]
+) -> Tuple["Image.Image", Tuple[int, int]]:
+    """
+    Crop a region from a source page image, using the decoded-page cache.
+
+    Pages decoded earlier in this process are cropped from memory. Otherwise
+    the on-disk cache is tried: its files hold a "mode width height" header
+    line followed by the raw pixel rows, so a hit reads only the rows inside
+    the crop box. A miss decodes the whole PNG (which cannot be decoded by
+    region) and writes the cache entry, evicting the least recently used
+    entries once the cache exceeds _IMAGE_CACHE_MAX_BYTES.
+
+    Args:
+        source_path: Path to source image
+        box_for_size: Maps the source (width, height) to the crop box
+            (left, top, right, bottom); may raise ValueError
+
+    Returns:
+        Tuple of (cropped_image, source_dimensions)
+    """
+    from PIL import Image
+
+    mtime_ns = source_path.stat().st_mtime_ns
+    key = source_path.resolve()
+    if key in _OPEN_IMAGES and _OPEN_IMAGES[key][0] == mtime_ns:
+        _OPEN_IMAGES.move_to_end(key)
+        img = _OPEN_IMAGES[key][1]
+        return img.crop(box_for_size(*img.size)), img.size
+
+    cache_path = _image_cache_path(source_path, mtime_ns)
+
+    try:
+        f = open(cache_path, "rb")
+    except OSError:
+        f = None
+
+    if f is not None:
+        with f:
+            try:
+                mode, width, height = f.readline().decode("ascii").split()
+                width, height = int(width), int(height)
+            except (UnicodeDecodeError, ValueError):
+                mode = None  # Corrupt entry; fall through and rewrite it
+
+            if mode in _CACHEABLE_MODES:
+                left, top, right, bottom = box_for_size(width, height)
+
+                stride = _row_stride(mode, width)
+                f.seek(top * stride, 1)
+                rows = f.read((bottom - top) * stride)
+                if len(rows) == (bottom - top) * stride:
+                    os.utime(cache_path)  # Mark as recently used for eviction
+                    band = Image.frombytes(mode, (width, bottom - top), rows)
+                    return band.crop((left, 0, right, bottom - top)), (width, height)
+
+    img = Image.open(source_path)
+    img.load()
+
+    if img.mode in _CACHEABLE_MODES:
+        _IMAGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(f"{img.mode} {img.width} {img.height}\n".encode("ascii"))
+            f.write(img.tobytes())
+        tmp_path.replace(cache_path)
+        _prune_image_cache()
+
+    _OPEN_IMAGES[key] = (mtime_ns, img)
+    _OPEN_IMAGES.move_to_end(key)
+    if len(_OPEN_IMAGES) > _OPEN_IMAGES_MAXSIZE:
+        _OPEN_IMAGES.popitem(last=False)
+
+    return img.crop(box_for_size(*img.size)), img.size
+
+
 def crop_image_by_percentage(
     source_path: Path,
     top_percent: float,
     bottom_percent: float,
     left_percent: float = 0,
     right_percent: float = 100
-) -> Tuple[Image.Image, Dict[str, int], Dict[str, float], Tuple[int, int]]:
+) -> Tuple["Image.Image", Dict[str, int], Dict[str, float], Tuple[int, int]]:
     """
     Crop an image using percentage-based coordinates.
 
@@ -178,34 +310,37 @@ def crop_image_by_percentage(
     if not source_path.exists():
         raise FileNotFoundError(f"Source image not found: {source_path}")
 
-    img = Image.open(source_path)
-    width, height = img.size
-
-    # Convert percentages to pixel coordinates
-    left_px = int(width * left_percent / 100)
-    right_px = int(width * right_percent / 100)
-    top_px = int(height * top_percent / 100)
-    bottom_px = int(height * bottom_percent / 100)
-
-    # Validate minimum crop size
+    # Convert percentages to pixel coordinates once the source size is known
+    def pixel_box(width: int, height: int) -> Tuple[int, int, int, int]:
+        left_px = int(width * left_percent / 100)
+        right_px = int(width * right_percent / 100)
+        top_px = int(height * top_percent / 100)
+        bottom_px = int(height * bottom_percent / 100)
+
+        # Validate minimum crop size
+        crop_width = right_px - left_px
+        crop_height = bottom_px - top_px
+
+        if crop_height < MIN_CROP_SIZE:
+            raise ValueError(
+                f"Crop height too small: {crop_height}px (minimum: {MIN_CROP_SIZE}px). "
+                f"Increase the range between top_percent ({top_percent}) and bottom_percent ({bottom_percent})."
+            )
+
+        if crop_width < MIN_CROP_SIZE:
+            raise ValueError(
+                f"Crop width too small: {crop_width}px (minimum: {MIN_CROP_SIZE}px). "
+                f"Increase the range between left_percent ({left_percent}) and right_percent ({right_percent})."
+            )
+
+        return left_px, top_px, right_px, bottom_px
+
+    # Crop image (PIL uses left, top, right, bottom); only the needed rows are read on a cache hit
+    cropped, source_dimensions = load_source_region(source_path, pixel_box)
+    left_px, top_px, right_px, bottom_px = pixel_box(*source_dimensions)
     crop_width = right_px - left_px
     crop_height = bottom_px - top_px
 
-    if crop_height < MIN_CROP_SIZE:
-        raise ValueError(
-            f"Crop height too small: {crop_height}px (minimum: {MIN_CROP_SIZE}px). "
-            f"Increase the range between top_percent ({top_percent}) and bottom_percent ({bottom_percent})."
-        )
-
-    if crop_width < MIN_CROP_SIZE:
-        raise ValueError(
-            f"Crop width too small: {crop_width}px (minimum: {MIN_CROP_SIZE}px). "
-            f"Increase the range between left_percent ({left_percent}) and right_percent ({right_percent})."
-        )
-
-    # Crop image (PIL uses left, top, right, bottom)
-    cropped = img.crop((left_px, top_px, right_px, bottom_px))
-
     pixel_coords = {
         "left": left_px,
         "top": top_px,
@@ -222,8 +357,6 @@ def crop_image_by_percentage(
         "bottom": bottom_percent
     }
 
-    source_dimensions = (width, height)
-
     return cropped, pixel_coords, percent_coords, source_dimensions
 
 
@@ -261,6 +394,8 @@ def generate_metadata(
     Returns:
         Metadata dictionary
     """
+    from datetime import datetime
+
     now = datetime.utcnow().isoformat() + "Z"
 
     metadata = {
@@ -306,8 +441,185 @@ def generate_metadata(
     return metadata
 
 
+# Defaults for optional process_job() fields, matching the CLI defaults
+JOB_DEFAULTS = {
+    "left_percent": 0,
+    "right_percent": 100,
+    "theorem": "",
+    "equation": "",
+    "description": "",
+    "output_dir": DEFAULT_OUTPUT_DIR,
+    "dpi": DEFAULT_DPI,
+    "force": False,
+}
+
+
+def process_job(job: Dict, log: Callable[..., None] = lambda *args: None) -> Dict:
+    """
+    Crop one formula and write its image and metadata files.
+
+    Args:
+        job: Extraction parameters, keyed like the CLI options (pdf, page,
+            top_percent, bottom_percent, and optionally the JOB_DEFAULTS keys)
+        log: Progress reporter (print for the CLI; silent by default)
+
+    Returns:
+        Dictionary with the formula_id and the written image and metadata paths
+
+    Raises:
+        FileExistsError: If output files exist and force is not set
+            (args[0] lists them)
+        FileNotFoundError: If the source page image doesn't exist
+        ValueError: If the PDF ID or crop region is invalid
+    """
+    missing = [key for key in ("pdf", "page", "top_percent", "bottom_percent") if key not in job]
+    if missing:
+        raise ValueError(f"Job is missing required fields: {', '.join(missing)}")
+
+    args = argparse.Namespace(**{**JOB_DEFAULTS, **job})
+    args.output_dir = Path(args.output_dir)
+
+    # Validate PDF ID
+    validate_pdf_id(args.pdf)
+
+    # Generate formula ID
+    formula_id = generate_formula_id(
+        args.pdf,
+        args.page,
+        args.theorem if args.theorem else None,
+        args.equation if args.equation else None
+    )
+
+    log(f"Formula Extraction")
+    log("=" * 60)
+    log(f"Formula ID: {formula_id}")
+    log(f"Source: {args.pdf}, page {args.page}")
+    log(f"Crop region: {args.top_percent:.1f}% - {args.bottom_percent:.1f}% (vertical)")
+    if args.left_percent != 0 or args.right_percent != 100:
+        log(f"            {args.left_percent:.1f}% - {args.right_percent:.1f}% (horizontal)")
+    log()
+
+    # Get source image path
+    source_path = get_source_image_path(args.pdf, args.page)
+    log(f"Source image: {source_path}")
+
+    # Crop the image
+    cropped_img, pixel_coords, percent_coords, source_dimensions = crop_image_by_percentage(
+        source_path,
+        args.top_percent,
+        args.bottom_percent,
+        args.left_percent,
+        args.right_percent
+    )
+
+    log(f"Source dimensions: {source_dimensions[0]}x{source_dimensions[1]} pixels")
+    log(f"Crop coordinates: ({pixel_coords['left']}, {pixel_coords['top']}) to ({pixel_coords['right']}, {pixel_coords['bottom']})")
+    log(f"Cropped size: {pixel_coords['width']}x{pixel_coords['height']} pixels")
+    log()
+
+    # Create output directory
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Generate output filenames
+    sanitized_id = sanitize_for_filename(formula_id)
+    output_image_path = args.output_dir / f"{sanitized_id}.png"
+    output_metadata_path = args.output_dir / f"{sanitized_id}.json"
+
+    # Check for existing files (overwrite protection)
+    if not args.force:
+        if output_image_path.exists() or output_metadata_path.exists():
+            existing_files = []
+            if output_image_path.exists():
+                existing_files.append(str(output_image_path))
+            if output_metadata_path.exists():
+                existing_files.append(str(output_metadata_path))
+
+            raise FileExistsError(existing_files)
+
+    # Save cropped image
+    cropped_img.save(output_image_path, "PNG")
+    log(f"Saved image: {output_image_path}")
+
+    # Generate and save metadata
+    metadata = generate_metadata(
+        formula_id,
+        args.pdf,
+        args.page,
+        args.theorem,
+        args.equation,
+        args.description,
+        source_path,
+        output_image_path,
+        pixel_coords,
+        percent_coords,
+        source_dimensions,
+        args.dpi
+    )
+
+    with open(output_metadata_path, 'w') as f:
+        json.dump(metadata, f, indent=2)
+
+    log(f"Saved metadata: {output_metadata_path}")
+    log()
+
+    # Print summary
+    log("=" * 60)
+    log("Extraction Complete")
+    log("=" * 60)
+    log(f"Formula ID: {formula_id}")
+    if args.theorem:
+        log(f"Theorem: {args.theorem}")
+    if args.equation:
+        log(f"Equation: {args.equation}")
+    if args.description:
+        log(f"Description: {args.description}")
+    log()
+    log("Next steps:")
+    log("  1. Use LaTeX agent to extract formula from the image")
+    log("  2. Verify the extracted LaTeX")
+    log("  3. Update metadata with LaTeX and verification info")
+    log()
+    log(f"Files created:")
+    log(f"  - {output_image_path}")
+    log(f"  - {output_metadata_path}")
+
+    return {
+        "formula_id": formula_id,
+        "image": str(output_image_path),
+        "metadata": str(output_metadata_path)
+    }
+
+
+def serve() -> None:
+    """
+    Process jobs from stdin, one JSON object per line, until EOF.
+
+    Writes one JSON line per job to stdout: process_job's result plus
+    "ok": true, or {"ok": false, "error": ...}. Reusing the process skips the
+    interpreter start-up, PIL import and source page decode for every crop.
+    """
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            result = {"ok": True, **process_job(json.loads(line))}
+        except FileExistsError as e:
+            result = {"ok": False, "error": f"Output files already exist: {', '.join(e.args[0])}"}
+        except Exception as e:
+            result = {"ok": False, "error": str(e)}
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+
 def main():
     """Main entry point for the formula extraction script."""
+    # --serve replaces the per-formula options, so check for it before they are required
+    serve_parser = argparse.ArgumentParser(add_help=False)
+    serve_parser.add_argument("--serve", action="store_true")
+    if serve_parser.parse_known_args()[0].serve:
+        serve()
+        return
+
     parser = argparse.ArgumentParser(
         description="Extract mathematical formulas from PDF page images",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -325,6 +637,11 @@ Example:
 This will create:
   - formulas/lectures_on_convex_optimization_page_0276_theorem_4_1_6.png
   - formulas/lectures_on_convex_optimization_page_0276_theorem_4_1_6.json
+
+For many crops, run %(prog)s --serve and write one JSON job per line to
+stdin, keyed like the options above (e.g. {"pdf": ..., "page": 276,
+"top_percent": 59.1, "bottom_percent": 71.8}); one JSON result line is
+written per job.
         """
     )
 
@@ -402,118 +719,24 @@ This will create:
         action="store_true",
         help="Overwrite existing files if they exist"
     )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Read JSON jobs from stdin instead (see below)"
+    )
 
     args = parser.parse_args()
 
     try:
-        # Validate PDF ID
-        validate_pdf_id(args.pdf)
-
-        # Generate formula ID
-        formula_id = generate_formula_id(
-            args.pdf,
-            args.page,
-            args.theorem if args.theorem else None,
-            args.equation if args.equation else None
-        )
+        process_job(vars(args), log=print)
 
-        print(f"Formula Extraction")
-        print("=" * 60)
-        print(f"Formula ID: {formula_id}")
-        print(f"Source: {args.pdf}, page {args.page}")
-        print(f"Crop region: {args.top_percent:.1f}% - {args.bottom_percent:.1f}% (vertical)")
-        if args.left_percent != 0 or args.right_percent != 100:
-            print(f"            {args.left_percent:.1f}% - {args.right_percent:.1f}% (horizontal)")
+    except FileExistsError as e:
+        print(f"Error: Output files already exist:")
+        for f in e.args[0]:
+            print(f"  - {f}")
         print()
-
-        # Get source image path
-        source_path = get_source_image_path(args.pdf, args.page)
-        print(f"Source image: {source_path}")
-
-        # Crop the image
-        cropped_img, pixel_coords, percent_coords, source_dimensions = crop_image_by_percentage(
-            source_path,
-            args.top_percent,
-            args.bottom_percent,
-            args.left_percent,
-            args.right_percent
-        )
-
-        print(f"Source dimensions: {source_dimensions[0]}x{source_dimensions[1]} pixels")
-        print(f"Crop coordinates: ({pixel_coords['left']}, {pixel_coords['top']}) to ({pixel_coords['right']}, {pixel_coords['bottom']})")
-        print(f"Cropped size: {pixel_coords['width']}x{pixel_coords['height']} pixels")
-        print()
-
-        # Create output directory
-        args.output_dir.mkdir(parents=True, exist_ok=True)
-
-        # Generate output filenames
-        sanitized_id = sanitize_for_filename(formula_id)
-        output_image_path = args.output_dir / f"{sanitized_id}.png"
-        output_metadata_path = args.output_dir / f"{sanitized_id}.json"
-
-        # Check for existing files (overwrite protection)
-        if not args.force:
-            if output_image_path.exists() or output_metadata_path.exists():
-                existing_files = []
-                if output_image_path.exists():
-                    existing_files.append(str(output_image_path))
-                if output_metadata_path.exists():
-                    existing_files.append(str(output_metadata_path))
-
-                print(f"Error: Output files already exist:")
-                for f in existing_files:
-                    print(f"  - {f}")
-                print()
-                print("Use --force to overwrite existing files.")
-                sys.exit(1)
-
-        # Save cropped image
-        cropped_img.save(output_image_path, "PNG")
-        print(f"Saved image: {output_image_path}")
-
-        # Generate and save metadata
-        metadata = generate_metadata(
-            formula_id,
-            args.pdf,
-            args.page,
-            args.theorem,
-            args.equation,
-            args.description,
-            source_path,
-            output_image_path,
-            pixel_coords,
-            percent_coords,
-            source_dimensions,
-            args.dpi
-        )
-
-        with open(output_metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
-
-        print(f"Saved metadata: {output_metadata_path}")
-        print()
-
-        # Print summary
-        print("=" * 60)
-        print("Extraction Complete")
-        print("=" * 60)
-        print(f"Formula ID: {formula_id}")
-        if args.theorem:
-            print(f"Theorem: {args.theorem}")
-        if args.equation:
-            print(f"Equation: {args.equation}")
-        if args.description:
-            print(f"Description: {args.description}")
-        print()
-        print("Next steps:")
-        print("  1. Use LaTeX agent to extract formula from the image")
-        print("  2. Verify the extracted LaTeX")
-        print("  3. Update metadata with LaTeX and verification info")
-        print()
-        print(f"Files created:")
-        print(f"  - {output_image_path}")
-        print(f"  - {output_metadata_path}")
+        print("Use --force to overwrite existing files.")
+        sys.exit(1)
 
     except FileNotFoundError as e:
         print(f"Error: {e}", file=sys.stderr)
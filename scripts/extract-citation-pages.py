@@ -1,13 +1,36 @@
 #!/usr/bin/env python3
 
 import json
+import os
+import re
 import subprocess
 import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from citations_utils import load_citations_data
 
+EXTRACTED_PAGES_DIR = Path('docs/references/extracted-pages')
+
+# PDFs extracted at once; the CPUs are shared among their extractors
+PARALLEL_PDFS = 4
+
+# One page ("100") or range ("100-101") of a page list, whitespace allowed anywhere
+_PAGE_RANGE_RE = re.compile(r'\s*(\d+)\s*(?:-\s*(\d+)\s*)?')
+
+def list_extracted_pages():
+    """Names of the page images already extracted (one directory read, not a stat per page)."""
+    try:
+        return set(os.listdir(EXTRACTED_PAGES_DIR))
+    except FileNotFoundError:
+        return set()
+
+def page_filename(pdf_id, page):
+    """Image name written by extract-pdf-pages.py: PDF ID + _page_NNNN.png."""
+    return f"{pdf_id}_page_{page:04d}.png"
+
 def load_pdf_id_mapping():
-    """Load chunk index and create a mapping from filename to PDF ID."""
+    """Load chunk index; returns (filename -> PDF ID, PDF ID -> total pages)."""
     index_path = Path('docs/references/chunk-index.json')
     if not index_path.exists():
         print(f"Error: chunk-index.json not found at {index_path}")
@@ -19,15 +42,48 @@ def load_pdf_id_mapping():
 
     # Create reverse mapping: source_file -> pdf_id
     filename_to_id = {}
+    total_pages = {}
     for pdf_id, metadata in index.items():
         source_file = metadata['source_file']
         filename_to_id[source_file] = pdf_id
-
-    return filename_to_id
+        total_pages[pdf_id] = metadata['total_pages']
+
+    return filename_to_id, total_pages
+
+def extract_pdf_pages(pdf_id, pages, jobs):
+    """Extract one PDF's pages at 300 DPI with up to jobs workers; returns (report lines, success/error counts)."""
+    lines = []
+    counts = Counter()
+
+    # Run extraction for all of this PDF's pages at once
+    try:
+        subprocess.run(
+            ['python3', 'scripts/extract-pdf-pages.py', pdf_id, ','.join(map(str, pages)), '--dpi', '300',
+             '--jobs', str(jobs)],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+    except subprocess.CalledProcessError as e:
+        lines.append(f"❌ Error extracting {pdf_id} pages {pages}: {e.stderr or e.stdout}")
+        counts['error'] += len(pages)
+        return lines, counts
+
+    # The extractor skips pages it fails on, so check each output
+    extracted = list_extracted_pages()
+    for page in pages:
+        if page_filename(pdf_id, page) in extracted:
+            lines.append(f"✅ Extracted: {pdf_id} page {page}")
+            counts['success'] += 1
+        else:
+            lines.append(f"❌ Error extracting {pdf_id} page {page}")
+            counts['error'] += 1
+
+    return lines, counts
 
 def main():
     # Load PDF ID mapping
-    filename_to_id = load_pdf_id_mapping()
+    filename_to_id, total_pages = load_pdf_id_mapping()
 
     # Load citations data
     data = load_citations_data()
@@ -58,22 +114,15 @@ def main():
             continue
 
         # Parse page numbers (could be "100", "100-101", "48, 50")
-        page_parts = pages.replace(' ', '').split(',')
-        for part in page_parts:
-            if '-' in part:
-                # Range
-                start, end = part.split('-')
-                try:
-                    for page in range(int(start), int(end) + 1):
-                        pages_to_extract.add((pdf_id, page))
-                except ValueError:
-                    print(f"Warning: Could not parse page range '{part}' in {citation_id}")
-            else:
-                # Single page
-                try:
-                    pages_to_extract.add((pdf_id, int(part)))
-                except ValueError:
-                    print(f"Warning: Could not parse page '{part}' in {citation_id}")
+        for part in pages.split(','):
+            match = _PAGE_RANGE_RE.fullmatch(part)
+            if not match:
+                kind = 'page range' if '-' in part else 'page'
+                print(f"Warning: Could not parse {kind} '{part.strip()}' in {citation_id}")
+                continue
+            start = int(match[1])
+            end = int(match[2] or start)
+            pages_to_extract.update((pdf_id, page) for page in range(start, end + 1))
 
     if unmapped_files:
         print("Warning: Could not map the following files to PDF IDs:")
@@ -92,29 +141,43 @@ def main():
     skip_count = 0
     error_count = 0
 
+    # Group the missing pages by PDF, so each PDF needs one extractor run
+    pages_by_pdf = defaultdict(list)
+    existing = list_extracted_pages()
     for pdf_id, page in pages_to_extract:
         # Check if page already exists
-        # The script uses the PDF ID + _page_NNNN.png format
-        output_file = f"docs/references/extracted-pages/{pdf_id}_page_{page:04d}.png"
-
-        if Path(output_file).exists():
+        if page_filename(pdf_id, page) in existing:
             print(f"⏭️  Already exists: {pdf_id} page {page}")
             skip_count += 1
             continue
 
-        # Run extraction
-        try:
-            result = subprocess.run(
-                ['python3', 'scripts/extract-pdf-pages.py', pdf_id, str(page), '--dpi', '300'],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            print(f"✅ Extracted: {pdf_id} page {page}")
-            success_count += 1
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Error extracting {pdf_id} page {page}: {e.stderr}")
+        # The extractor rejects the whole batch if any page is out of range,
+        # so report those pages here and leave them out
+        if not 1 <= page <= total_pages[pdf_id]:
+            print(f"❌ Error extracting {pdf_id} page {page}: PDF has {total_pages[pdf_id]} pages")
             error_count += 1
+            continue
+
+        pages_by_pdf[pdf_id].append(page)
+
+    # PDFs are independent, so run a few extractions in parallel (threads
+    # suffice since the work happens in the subprocesses). Each extractor runs
+    # its own worker pool, so the CPUs are split between them.
+    cpus = os.cpu_count() or 1
+    pdf_jobs = max(1, min(PARALLEL_PDFS, len(pages_by_pdf), cpus))
+    page_jobs = max(1, cpus // pdf_jobs)
+    with ThreadPoolExecutor(max_workers=pdf_jobs) as executor:
+        outcomes = list(executor.map(
+            lambda item: extract_pdf_pages(*item, page_jobs), pages_by_pdf.items()
+        ))
+
+    counts = Counter()
+    for lines, pdf_counts in outcomes:
+        for line in lines:
+            print(line)
+        counts.update(pdf_counts)
+    success_count += counts['success']
+    error_count += counts['error']
 
     print()
     print(f"Summary:")
@@ -11,14 +11,19 @@ Usage:
     python3 scripts/extract-pdf-pages.py liunocedal1989 5-7
     python3 scripts/extract-pdf-pages.py numericaloptimization2006 27
     python3 scripts/extract-pdf-pages.py boyd_vandenberghe-2004-convex_optimization 100,105,110
+
+Pages are rendered in-process with pypdfium2 when it is installed
+(`uv pip install pypdfium2`), and with poppler's pdftoppm otherwise.
 """
 
 import argparse
 import json
+import os
 import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 # Configuration
 REFERENCES_DIR = Path("docs/references")
@@ -26,6 +31,15 @@ INDEX_FILE = REFERENCES_DIR / "chunk-index.json"
 OUTPUT_DIR = REFERENCES_DIR / "extracted-pages"
 DPI = 150  # Resolution for PDF to image conversion
 
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
+# PDF opened once per pdfium worker process (pdfium is not thread-safe)
+_worker_pdf = None
+
 
 def load_index() -> dict:
     """Load the chunk index to find source PDFs."""
@@ -61,42 +75,213 @@ def parse_page_numbers(page_spec: str) -> List[int]:
     return sorted(set(pages))
 
 
-def extract_pages(pdf_path: Path, pages: List[int], output_dir: Path, pdf_id: str, dpi: int = DPI) -> List[Path]:
+def _extract_one(pdf_path: Path, page_num: int, output_dir: Path, pdf_id: str, dpi: int) -> Optional[Path]:
     """
-    Extract specified pages from PDF as PNG images using pdftoppm.
+    Extract a single page as PNG with pdftoppm.
 
-    Returns: List of paths to generated image files
+    Returns: Path to the generated image, or None if pdftoppm failed
     """
-    output_dir.mkdir(parents=True, exist_ok=True)
-    generated_files = []
+    output_file = output_dir / f"{pdf_id}_page_{page_num:04d}.png"
+
+    # Use pdftoppm to convert specific page to PNG
+    # -f = first page, -l = last page (same for single page)
+    # -singlefile = output single file without page number suffix
+    # -png = output as PNG
+    # -r = resolution in DPI
+    try:
+        subprocess.run([
+            "pdftoppm",
+            "-f", str(page_num),
+            "-l", str(page_num),
+            "-singlefile",
+            "-png",
+            "-r", str(dpi),
+            str(pdf_path),
+            str(output_file.with_suffix(''))  # pdftoppm adds .png
+        ], check=True, capture_output=True)
 
+        return output_file
+
+    except subprocess.CalledProcessError as e:
+        print(f"Error extracting page {page_num}: {e.stderr.decode()}")
+        return None
+
+
+def _page_runs(pages: List[int], max_run: int) -> List[Tuple[int, int]]:
+    """
+    Coalesce sorted page numbers into (start, end) runs of consecutive pages.
+
+    Runs longer than max_run are split so the work spreads across workers.
+    """
+    runs = []
     for page_num in pages:
+        if runs and page_num == runs[-1][1] + 1 and page_num - runs[-1][0] < max_run:
+            runs[-1] = (runs[-1][0], page_num)
+        else:
+            runs.append((page_num, page_num))
+    return runs
+
+
+def _extract_run(pdf_path: Path, start: int, end: int, output_dir: Path, pdf_id: str, dpi: int) -> Dict[int, Path]:
+    """
+    Extract pages start..end with one pdftoppm call (one PDF open).
+
+    Without -singlefile pdftoppm writes <prefix>-<page>.png, zero-padded to
+    the digits of the document's page count; those files are renamed to the
+    <pdf_id>_page_NNNN.png scheme. If the call fails part-way, the pages it
+    did not write are retried one at a time.
+
+    Returns: Mapping from page number to generated image path
+    """
+    if start == end:
+        output_file = _extract_one(pdf_path, start, output_dir, pdf_id, dpi)
+        return {start: output_file} if output_file is not None else {}
+
+    prefix = output_dir / f".{pdf_id}_pages_{start:04d}-{end:04d}"
+    result = subprocess.run([
+        "pdftoppm",
+        "-f", str(start),
+        "-l", str(end),
+        "-png",
+        "-r", str(dpi),
+        str(pdf_path),
+        str(prefix)
+    ], capture_output=True)
+
+    generated = {}
+    for image in output_dir.glob(f"{prefix.name}-*.png"):
+        page_num = int(image.stem.rsplit('-', 1)[1])
         output_file = output_dir / f"{pdf_id}_page_{page_num:04d}.png"
+        image.replace(output_file)
+        generated[page_num] = output_file
+
+    if result.returncode != 0:
+        for page_num in range(start, end + 1):
+            if page_num not in generated:
+                output_file = _extract_one(pdf_path, page_num, output_dir, pdf_id, dpi)
+                if output_file is not None:
+                    generated[page_num] = output_file
+
+    return generated
+
+
+def _init_pdfium_worker(pdf_path: Path) -> None:
+    """Open the PDF for this process's renders."""
+    global _worker_pdf
+    _worker_pdf = pdfium.PdfDocument(str(pdf_path))
+
+
+def _save_png(image, output_file: Path) -> Path:
+    """Encode and write one rendered page."""
+    image.save(output_file, format="PNG")
+    return output_file
+
 
-        # Use pdftoppm to convert specific page to PNG
-        # -f = first page, -l = last page (same for single page)
-        # -singlefile = output single file without page number suffix
-        # -png = output as PNG
-        # -r = resolution in DPI
-        try:
-            subprocess.run([
-                "pdftoppm",
-                "-f", str(page_num),
-                "-l", str(page_num),
-                "-singlefile",
-                "-png",
-                "-r", str(dpi),
-                str(pdf_path),
-                str(output_file.with_suffix(''))  # pdftoppm adds .png
-            ], check=True, capture_output=True)
+def _render_pages_pdfium(pages: List[int], output_dir: Path, pdf_id: str, dpi: int) -> Dict[int, Path]:
+    """
+    Render pages from the already-open PDF and save them as PNG.
+
+    PNG encoding and writing happen on a background thread (PIL releases
+    the GIL while compressing), so each write overlaps the next page's
+    render; rendering itself stays on this thread.
+
+    Returns: Mapping from page number to generated image path
+    """
+    generated = {}
+    saves = {}
+
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        for page_num in pages:
+            output_file = output_dir / f"{pdf_id}_page_{page_num:04d}.png"
+            try:
+                page = _worker_pdf[page_num - 1]
+                bitmap = page.render(scale=dpi / 72)  # PDF units are 1/72 inch
+                saves[page_num] = writer.submit(_save_png, bitmap.to_pil(), output_file)
+                page.close()
+
+            except pdfium.PdfiumError as e:
+                print(f"Error extracting page {page_num}: {e}")
+
+        for page_num, save in saves.items():
+            try:
+                generated[page_num] = save.result()
+            except OSError as e:
+                print(f"Error extracting page {page_num}: {e}")
+
+    return generated
+
+
+def extract_pages_pdfium(
+    pdf_path: Path, pages: List[int], output_dir: Path, pdf_id: str, dpi: int = DPI,
+    jobs: Optional[int] = None
+) -> List[Path]:
+    """
+    Extract specified pages from PDF as PNG images using pypdfium2.
+
+    Each worker process (up to jobs, default one per CPU) opens the PDF once
+    and renders a contiguous block of the pages.
+
+    Returns: List of paths to generated image files, in page order
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    generated = {}
+
+    max_workers = min(len(pages), jobs or os.cpu_count() or 4) or 1
+    if max_workers == 1:
+        _init_pdfium_worker(pdf_path)
+        generated = _render_pages_pdfium(pages, output_dir, pdf_id, dpi)
+    else:
+        block_size = -(-len(pages) // max_workers)
+        blocks = [pages[i:i + block_size] for i in range(0, len(pages), block_size)]
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_pdfium_worker,
+            initargs=(pdf_path,)
+        ) as executor:
+            futures = [
+                executor.submit(_render_pages_pdfium, block, output_dir, pdf_id, dpi)
+                for block in blocks
+            ]
+            for future in as_completed(futures):
+                generated.update(future.result())
+
+    return [generated[page_num] for page_num in pages if page_num in generated]
+
+
+def extract_pages(
+    pdf_path: Path, pages: List[int], output_dir: Path, pdf_id: str, dpi: int = DPI,
+    jobs: Optional[int] = None
+) -> List[Path]:
+    """
+    Extract specified pages from PDF as PNG images using pdftoppm.
+
+    Uses extract_pages_pdfium instead when pypdfium2 is installed.
+
+    Consecutive pages share one pdftoppm call, and up to jobs calls
+    (default one per CPU) run concurrently.
+
+    Returns: List of paths to generated image files, in page order
+    """
+    if PDFIUM_AVAILABLE:
+        return extract_pages_pdfium(pdf_path, pages, output_dir, pdf_id, dpi, jobs)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    generated = {}
 
-            generated_files.append(output_file)
+    # Cap run length so a single long range still uses every worker
+    max_workers = min(len(pages), jobs or os.cpu_count() or 4) or 1
+    runs = _page_runs(pages, max_run=-(-len(pages) // max_workers))
 
-        except subprocess.CalledProcessError as e:
-            print(f"Error extracting page {page_num}: {e.stderr.decode()}")
-            continue
+    # Threads suffice: each one just waits on its pdftoppm process
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_extract_run, pdf_path, start, end, output_dir, pdf_id, dpi)
+            for start, end in runs
+        ]
+        for future in as_completed(futures):
+            generated.update(future.result())
 
-    return generated_files
+    return [generated[page_num] for page_num in pages if page_num in generated]
 
 
 def main():
@@ -119,6 +304,8 @@ Examples:
     parser.add_argument("pages", help="Page numbers (e.g., '5', '5-7', '5,7,9', '5-7,10')")
     parser.add_argument("--dpi", type=int, default=DPI, help=f"Image resolution (default: {DPI})")
     parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR, help="Output directory")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Number of pages rendered in parallel (default: one per CPU)")
 
     args = parser.parse_args()
 
@@ -161,7 +348,7 @@ Examples:
     print(f"Output: {args.output_dir}")
     print()
 
-    output_files = extract_pages(pdf_path, pages, args.output_dir, args.pdf_id, args.dpi)
+    output_files = extract_pages(pdf_path, pages, args.output_dir, args.pdf_id, args.dpi, args.jobs)
 
     if output_files:
         print(f"\n✓ Successfully extracted {len(output_files)} page(s):")
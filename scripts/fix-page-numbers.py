@@ -7,48 +7,32 @@ ProofPages are the source of truth since they show where theorems actually are.
 import json
 import re
 from pathlib import Path
-from citations_utils import load_citations_data, save_citation
+from citations_utils import load_citations_data, save_citation, format_ranges
+
+# proofPages image names end in _page_NNNN.png (compiled once)
+_PAGE_RE = re.compile(r'_page_(\d+)\.png$')
 
 def extract_pdf_page_from_path(path):
     """Extract PDF page number from path like 'docs/.../file_page_0101.png'"""
-    match = re.search(r'_page_(\d+)\.png$', path)
+    match = _PAGE_RE.search(path)
     if match:
         return int(match.group(1))
     return None
 
-def format_page_spec(pages):
-    """Format list of pages into compact spec like '8-10, 61'"""
-    if not pages:
-        return ""
-
-    pages = sorted(set(pages))
-    ranges = []
-    start = pages[0]
-    end = pages[0]
-
-    for page in pages[1:]:
-        if page == end + 1:
-            end = page
-        else:
-            ranges.append(f"{start}-{end}" if start != end else str(start))
-            start = end = page
-
-    ranges.append(f"{start}-{end}" if start != end else str(start))
-    return ', '.join(ranges)
-
 def main():
     data = load_citations_data()
     updates = []
 
+    # Per-reference values, looked up once rather than per citation
+    ref_offsets = {ref_id: ref.get('pageOffset', 0) for ref_id, ref in data['references'].items()}
+    is_journal = {ref_id: ref.get('journal') is not None for ref_id, ref in data['references'].items()}
+
     for citation_id, citation in data['citations'].items():
         ref_id = citation['reference']
-        ref = data['references'].get(ref_id)
-
-        if not ref:
+        page_offset = ref_offsets.get(ref_id)
+        if page_offset is None:
             continue
 
-        page_offset = ref.get('pageOffset', 0)
-
         # Get actual pages from proofPages
         proof_pages = citation.get('proofPages', [])
         if not proof_pages:
@@ -64,22 +48,22 @@ def main():
             continue
 
         actual_pdf_pages = sorted(set(actual_pdf_pages))
-        actual_book_pages = sorted([p - page_offset for p in actual_pdf_pages])
+        # Shifting by a constant keeps the sorted order, so no re-sort is needed
+        actual_book_pages = [p - page_offset for p in actual_pdf_pages]
 
         # Check if this is a journal article with publication pages (negative book pages = broken offset)
-        is_journal = ref.get('journal') is not None
-        has_negative_pages = any(p < 0 for p in actual_book_pages)
+        has_negative_pages = actual_book_pages[0] < 0  # Sorted, so the first page is the smallest
 
-        if is_journal and has_negative_pages:
+        if is_journal[ref_id] and has_negative_pages:
             # For journal articles, the PDF pages ARE the publication pages
             # Don't apply offset, just use PDF pages directly
             print(f"⚠️  {citation_id}: Journal article - using PDF pages as publication pages")
-            new_pages = format_page_spec(actual_pdf_pages)
-            new_pdf_pages = format_page_spec(actual_pdf_pages)
+            new_pages = format_ranges(actual_pdf_pages)
+            new_pdf_pages = format_ranges(actual_pdf_pages)
         else:
             # Normal case: apply offset
-            new_pages = format_page_spec(actual_book_pages)
-            new_pdf_pages = format_page_spec(actual_pdf_pages)
+            new_pages = format_ranges(actual_book_pages)
+            new_pdf_pages = format_ranges(actual_pdf_pages)
 
         # Update if different
         old_pages = citation.get('pages', '')
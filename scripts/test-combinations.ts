@@ -5,8 +5,14 @@
  * Usage:
  *   npm run test-combo -- --problem rosenbrock --algorithm lbfgs --alpha 0.001 --maxIter 100
  *   npm run test-combo -- --all  # Test all combinations
+ *   npm run test-combo -- --server  # Read JSON configs from stdin, one JSON result per line
+ *   npm run test-combo -- --batch manifest.json  # Run a JSON array of configs, one JSON result per line
+ *   npm run test-combo -- --problem quadratic --format json  # Also print a final JSON result line
  */
 
+import { readFileSync } from 'fs';
+import { createInterface } from 'readline';
+
 import { runGradientDescent } from '../src/algorithms/gradient-descent';
 import { runGradientDescentLineSearch } from '../src/algorithms/gradient-descent-linesearch';
 import { runNewton } from '../src/algorithms/newton';
@@ -310,18 +316,23 @@ function runTest(config: TestConfig): TestResult {
   }
 }
 
+// QUIET=1 (set by the Python validation suite) prints only the result block
+const QUIET = process.env.QUIET === '1';
+
 function printResult(result: TestResult) {
   const { config, iterations, finalLoss, finalGradNorm, converged, diverged, error } = result;
 
-  console.log('\n' + '='.repeat(70));
-  console.log(`Problem: ${config.problem} | Algorithm: ${config.algorithm}`);
-  console.log(`Initial: [${config.initialPoint?.join(', ')}] | MaxIter: ${config.maxIter}`);
-  if (config.alpha !== undefined) console.log(`  alpha: ${config.alpha}`);
-  if (config.c1 !== undefined) console.log(`  c1: ${config.c1}`);
-  if (config.m !== undefined) console.log(`  m: ${config.m}`);
-  if (config.hessianDamping !== undefined) console.log(`  hessianDamping: ${config.hessianDamping}`);
-  if (config.lineSearch !== undefined) console.log(`  lineSearch: ${config.lineSearch}`);
-  console.log('-'.repeat(70));
+  if (!QUIET) {
+    console.log('\n' + '='.repeat(70));
+    console.log(`Problem: ${config.problem} | Algorithm: ${config.algorithm}`);
+    console.log(`Initial: [${config.initialPoint?.join(', ')}] | MaxIter: ${config.maxIter}`);
+    if (config.alpha !== undefined) console.log(`  alpha: ${config.alpha}`);
+    if (config.c1 !== undefined) console.log(`  c1: ${config.c1}`);
+    if (config.m !== undefined) console.log(`  m: ${config.m}`);
+    if (config.hessianDamping !== undefined) console.log(`  hessianDamping: ${config.hessianDamping}`);
+    if (config.lineSearch !== undefined) console.log(`  lineSearch: ${config.lineSearch}`);
+    console.log('-'.repeat(70));
+  }
 
   if (error) {
     console.log(`❌ ERROR: ${error}`);
@@ -340,7 +351,7 @@ function printResult(result: TestResult) {
 
     // Show iteration path for debugging
     const allIters = (result as Record<string, unknown>).allIterations as Array<{ w: number[]; wNew: number[]; newLoss: number; gradNorm: number }> | undefined;
-    if (allIters) {
+    if (allIters && !QUIET) {
       if (allIters.length <= 5) {
         console.log(`   Iteration path:`);
         allIters.forEach((it, idx: number) => {
@@ -360,12 +371,56 @@ function printResult(result: TestResult) {
   }
 }
 
+// Machine-readable form of a result (JSON.stringify writes NaN/Infinity as null)
+function toJsonResult(result: TestResult) {
+  const lastIter = (result as Record<string, unknown>).lastIter as { wNew: number[] } | undefined;
+  return {
+    converged: result.converged,
+    diverged: result.diverged,
+    iterations: result.iterations,
+    final_loss: result.finalLoss,
+    final_grad_norm: result.finalGradNorm,
+    final_w: lastIter?.wNew ?? null,
+    error: result.error ?? null
+  };
+}
+
+// Long-lived mode for the Python validation suite: one TestConfig JSON per
+// stdin line, one result JSON per stdout line, until stdin closes. A request's
+// "id" field is echoed in its result so the client can match them up.
+async function runServer() {
+  const rl = createInterface({ input: process.stdin });
+  for await (const line of rl) {
+    if (!line.trim()) continue;
+    let id: unknown = null;
+    let result: TestResult;
+    try {
+      const request = JSON.parse(line) as TestConfig & { id?: unknown };
+      id = request.id ?? null;
+      result = runTest(request);
+    } catch (error) {
+      result = {
+        config: { problem: '', algorithm: 'gd-fixed' },
+        iterations: 0,
+        finalLoss: NaN,
+        finalGradNorm: NaN,
+        converged: false,
+        diverged: false,
+        error: error instanceof Error ? error.message : String(error)
+      };
+    }
+    console.log(JSON.stringify({ ...toJsonResult(result), id }));
+  }
+}
+
 // Parse command line arguments
-function parseArgs(): { configs: TestConfig[], runAll: boolean } {
+function parseArgs(): { configs: TestConfig[], runAll: boolean, format: 'text' | 'json' } {
   const args = process.argv.slice(2);
+  const formatIndex = args.indexOf('--format');
+  const format = formatIndex >= 0 && args[formatIndex + 1] === 'json' ? 'json' : 'text';
 
   if (args.includes('--all')) {
-    return { configs: [], runAll: true };
+    return { configs: [], runAll: true, format };
   }
 
   const config: TestConfig = {
@@ -435,7 +490,7 @@ function parseArgs(): { configs: TestConfig[], runAll: boolean } {
     }
   }
 
-  return { configs: [config], runAll: false };
+  return { configs: [config], runAll: false, format };
 }
 
 // Test all combinations
@@ -515,13 +570,28 @@ function testAllCombinations(): TestResult[] {
 
 // Main
 function main() {
-  const { configs, runAll } = parseArgs();
+  if (process.argv.includes('--server')) {
+    void runServer();
+    return;
+  }
+
+  const batchIndex = process.argv.indexOf('--batch');
+  if (batchIndex >= 0) {
+    const manifest = JSON.parse(readFileSync(process.argv[batchIndex + 1], 'utf-8')) as TestConfig[];
+    manifest.forEach(config => console.log(JSON.stringify(toJsonResult(runTest(config)))));
+    return;
+  }
+
+  const { configs, runAll, format } = parseArgs();
 
   if (runAll) {
     console.log('Running all problem/algorithm combinations...\n');
     const results = testAllCombinations();
 
     results.forEach(printResult);
+    if (format === 'json') {
+      results.forEach(result => console.log(JSON.stringify(toJsonResult(result))));
+    }
 
     // Summary
     console.log('\n' + '='.repeat(70));
@@ -541,6 +611,9 @@ function main() {
     configs.forEach(config => {
       const result = runTest(config);
       printResult(result);
+      if (format === 'json') {
+        console.log(JSON.stringify(toJsonResult(result)));
+      }
     });
   }
 }
@@ -13,7 +13,7 @@ Based on verified offsets:
 
 import json
 from pathlib import Path
-from citations_utils import load_citations_data, save_citation, save_references
+from citations_utils import load_citations_data, save_citation, save_references, format_ranges
 
 # Verified page offsets (PDF page - book page)
 PAGE_OFFSETS = {
@@ -45,34 +45,6 @@ def parse_page_numbers(page_str):
             pages.append(int(part))
     return pages
 
-def format_page_range(pages):
-    """Format list of pages into compact range string."""
-    if not pages:
-        return ""
-
-    pages = sorted(set(pages))
-    ranges = []
-    start = pages[0]
-    end = pages[0]
-
-    for page in pages[1:]:
-        if page == end + 1:
-            end = page
-        else:
-            if start == end:
-                ranges.append(str(start))
-            else:
-                ranges.append(f"{start}-{end}")
-            start = end = page
-
-    # Add final range
-    if start == end:
-        ranges.append(str(start))
-    else:
-        ranges.append(f"{start}-{end}")
-
-    return ', '.join(ranges)
-
 def main():
     data = load_citations_data()
 
@@ -80,12 +52,13 @@ def main():
     references_updated = False
     for ref_id, ref in data['references'].items():
         pdf_id = REFERENCE_TO_PDF_ID.get(ref_id)
-        if pdf_id and pdf_id in PAGE_OFFSETS:
+        if pdf_id and pdf_id in PAGE_OFFSETS and ref.get('pageOffset') != PAGE_OFFSETS[pdf_id]:
             ref['pageOffset'] = PAGE_OFFSETS[pdf_id]
             print(f"✓ Updated {ref_id}: pageOffset = {PAGE_OFFSETS[pdf_id]}")
             references_updated = True
 
     # Update citations with pdfPages field and correct pages field
+    updated_citations = []
     for citation_id, citation in data['citations'].items():
         ref_id = citation['reference']
         ref = data['references'].get(ref_id)
@@ -111,21 +84,31 @@ def main():
         # Calculate book pages
         book_pages = [p - offset for p in pdf_pages]
 
-        # Update citation
-        citation['pdfPages'] = format_page_range(pdf_pages)
-        citation['pages'] = format_page_range(book_pages)
+        # Update citation, if either field actually changes
+        new_pdf_pages = format_ranges(pdf_pages)
+        new_pages = format_ranges(book_pages)
+        if citation.get('pdfPages') == new_pdf_pages and citation['pages'] == new_pages:
+            continue
+
+        citation['pdfPages'] = new_pdf_pages
+        citation['pages'] = new_pages
+        updated_citations.append(citation_id)
 
         print(f"✓ Updated {citation_id}:")
         print(f"    pages (book): {citation['pages']}")
         print(f"    pdfPages: {citation['pdfPages']}")
 
+    if not references_updated and not updated_citations:
+        print("\n✅ No updates needed")
+        return
+
     # Save updated references
     if references_updated:
         save_references(data['references'])
 
     # Save updated citations
-    for citation_id, citation in data['citations'].items():
-        save_citation(citation_id, citation)
+    for citation_id in updated_citations:
+        save_citation(citation_id, data['citations'][citation_id])
 
     print(f"\n✅ Updated citation files")
 
@@ -8,11 +8,14 @@ import json
 import re
 from pathlib import Path
 from collections import defaultdict
-from citations_utils import load_citations_data
+from citations_utils import load_citations_data, format_ranges
+
+# proofPages image names end in _page_NNNN.png (compiled once)
+_PAGE_RE = re.compile(r'_page_(\d+)\.png$')
 
 def extract_pdf_page_from_path(path):
     """Extract PDF page number from path like 'docs/.../file_page_0101.png'"""
-    match = re.search(r'_page_(\d+)\.png$', path)
+    match = _PAGE_RE.search(path)
     if match:
         return int(match.group(1))
     return None
@@ -28,43 +31,19 @@ def parse_page_spec(spec):
             pages.append(int(part))
     return sorted(set(pages))
 
-def format_page_spec(pages):
-    """Format list of pages into compact spec like '8-10, 61'"""
-    if not pages:
-        return ""
-
-    pages = sorted(set(pages))
-    ranges = []
-    start = pages[0]
-    end = pages[0]
-
-    for page in pages[1:]:
-        if page == end + 1:
-            end = page
-        else:
-            ranges.append(f"{start}-{end}" if start != end else str(start))
-            start = end = page
-
-    ranges.append(f"{start}-{end}" if start != end else str(start))
-    return ', '.join(ranges)
-
 def main():
     data = load_citations_data()
     issues = []
 
+    # Per-reference values, looked up once rather than per citation
+    ref_offsets = {ref_id: ref.get('pageOffset', 0) for ref_id, ref in data['references'].items()}
+
     for citation_id, citation in data['citations'].items():
         ref_id = citation['reference']
-        ref = data['references'].get(ref_id)
-
-        if not ref:
+        page_offset = ref_offsets.get(ref_id)
+        if page_offset is None:
             continue
 
-        page_offset = ref.get('pageOffset', 0)
-
-        # Get claimed pages
-        claimed_book_pages = parse_page_spec(citation.get('pages', ''))
-        claimed_pdf_pages = parse_page_spec(citation.get('pdfPages', ''))
-
         # Get actual pages from proofPages
         proof_pages = citation.get('proofPages', [])
         if not proof_pages:
@@ -80,34 +59,37 @@ def main():
             continue
 
         actual_pdf_pages = sorted(set(actual_pdf_pages))
-        actual_book_pages = sorted([p - page_offset for p in actual_pdf_pages])
+        # Shifting by a constant keeps the sorted order, so no re-sort is needed
+        actual_book_pages = [p - page_offset for p in actual_pdf_pages]
+
+        # Fast path: claimed specs already in canonical form match as strings
+        actual_book_spec = format_ranges(actual_book_pages)
+        actual_pdf_spec = format_ranges(actual_pdf_pages)
+        claimed_book_spec = citation.get('pages', '')
+        claimed_pdf_spec = citation.get('pdfPages', '')
+        if claimed_book_spec == actual_book_spec and claimed_pdf_spec == actual_pdf_spec:
+            continue
 
-        # Check for mismatches
-        mismatch = False
+        # Otherwise compare the parsed pages (the specs may just be formatted differently)
+        claimed_book_pages = parse_page_spec(claimed_book_spec)
+        claimed_pdf_pages = parse_page_spec(claimed_pdf_spec)
 
+        mismatched_fields = []
         if claimed_book_pages != actual_book_pages:
-            issues.append({
-                'citation': citation_id,
-                'type': 'book_pages_mismatch',
-                'claimed_book_pages': format_page_spec(claimed_book_pages),
-                'actual_book_pages': format_page_spec(actual_book_pages),
-                'claimed_pdf_pages': format_page_spec(claimed_pdf_pages),
-                'actual_pdf_pages': format_page_spec(actual_pdf_pages),
-                'offset': page_offset
-            })
-            mismatch = True
-
+            mismatched_fields.append('pages')
         if claimed_pdf_pages != actual_pdf_pages:
+            mismatched_fields.append('pdfPages')
+
+        if mismatched_fields:
             issues.append({
                 'citation': citation_id,
-                'type': 'pdf_pages_mismatch',
-                'claimed_book_pages': format_page_spec(claimed_book_pages),
-                'actual_book_pages': format_page_spec(actual_book_pages),
-                'claimed_pdf_pages': format_page_spec(claimed_pdf_pages),
-                'actual_pdf_pages': format_page_spec(actual_pdf_pages),
+                'mismatched_fields': mismatched_fields,
+                'claimed_book_pages': format_ranges(claimed_book_pages),
+                'actual_book_pages': actual_book_spec,
+                'claimed_pdf_pages': format_ranges(claimed_pdf_pages),
+                'actual_pdf_pages': actual_pdf_spec,
                 'offset': page_offset
             })
-            mismatch = True
 
     if not issues:
         print("✅ All citations have consistent page numbers!")
@@ -117,6 +99,7 @@ def main():
 
     for issue in issues:
         print(f"❌ {issue['citation']}")
+        print(f"   Mismatched fields:   {', '.join(issue['mismatched_fields'])}")
         print(f"   Claimed book pages:  {issue['claimed_book_pages']}")
         print(f"   Actual book pages:   {issue['actual_book_pages']}")
         print(f"   Claimed PDF pages:   {issue['claimed_pdf_pages']}")